@@ -1,21 +1,15 @@
 """Configuration for AI Agent for Tenancies."""
 
+import functools
+import logging
 import os
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
+# Load environment variables from .env file (the settings below read them)
 env_path = Path(__file__).parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
-# Fix LangChain global settings compatibility issue
-try:
-    from langchain import globals as langchain_globals
-    langchain_globals.set_debug(False)
-    langchain_globals.set_verbose(False)
-except ImportError:
-    pass
-
 # ============================================================================
 # API Keys
 # ============================================================================
@@ -28,6 +22,39 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 LLM_MODEL_NAME = os.getenv("LLM_MODEL_NAME", None)  # None uses "gemini-2.5-flash"
 LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.0"))  # Default temperature
 
+# Process-wide request rate limit shared by every chat model (0 disables);
+# concurrent graph nodes queue here instead of tripping the API's 429s
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "300"))
+LLM_MAX_BURST = 10  # Requests allowed back-to-back after an idle period
+
+# Response cache: identical (prompt, model, temperature) calls are answered
+# from a local SQLite file instead of the API (set to "false" in tests)
+ENABLE_LLM_CACHE = os.getenv("ENABLE_LLM_CACHE", "true").lower() == "true"
+LLM_CACHE_PATH = Path(__file__).parent / ".llm_cache.db"
+
+# Semantic cache: standalone questions whose embedding is this similar to an
+# earlier one reuse its answer (catches paraphrases the exact cache misses)
+ENABLE_SEMANTIC_CACHE = os.getenv("ENABLE_SEMANTIC_CACHE", "true").lower() == "true"
+SEMANTIC_CACHE_THRESHOLD = 0.97
+SEMANTIC_CACHE_MAX_ENTRIES = 10000
+SEMANTIC_CACHE_TTL = 60 * 60  # seconds, for caches of index search results
+
+# Question classification (relevant / off-topic) is coarser than an answer,
+# so the RAG graph reuses it for looser paraphrases (never for questions
+# naming another province or country, which embed close to Ontario ones)
+CLASSIFY_CACHE_THRESHOLD = 0.92
+
+# Embedding pre-classifier: questions at least this similar to a known
+# tenancy question are relevant, below the lower bound off-topic; only the
+# band in between is sent to the LLM classifier (tune on real traffic).
+# Questions naming another province or country always go to the LLM
+CLASSIFY_RELEVANT_SIMILARITY = 0.60
+CLASSIFY_IRRELEVANT_SIMILARITY = 0.35
+
+# Retrieved context shorter than this (in characters) goes to the answer
+# prompt as-is instead of being summarized by an extra LLM call first
+SUMMARIZE_MIN_CONTEXT_CHARS = 4000
+
 # ============================================================================
 # Pinecone Settings
 # ============================================================================
@@ -37,10 +64,36 @@ PINECONE_INDEX_NAME = "tenancy-law"
 # Embedding Settings (BAAI/bge-m3)
 # ============================================================================
 LOCAL_MODEL_NAME = "BAAI/bge-m3"
-LOCAL_MODEL_DEVICE = "cpu"
+LOCAL_MODEL_DEVICE = os.getenv("LOCAL_MODEL_DEVICE", None)  # None auto-detects cuda/mps, else cpu
 EMBEDDING_DIMENSION = 1024
 NORMALIZE_EMBEDDINGS = True
 
+# Embeddings of recently seen texts kept in memory by BGEEmbeddings (0 disables)
+EMBEDDING_CACHE_SIZE = 4096
+
+# Bulk encoding batch size for ingestion; SentenceTransformer groups inputs by
+# length, so larger batches waste less padding (capped on CPU to bound RAM)
+ENCODE_BATCH_SIZE = int(os.getenv("ENCODE_BATCH_SIZE", "256"))
+ENCODE_BATCH_SIZE_CPU_MAX = 128
+
+# Devices to shard ingestion encoding across, one worker process each
+# (e.g. "cuda:0,cuda:1" or "cpu,cpu,cpu,cpu"); unset encodes in-process
+_encode_devices = os.getenv("ENCODE_DEVICES")
+ENCODE_DEVICES = [device.strip() for device in _encode_devices.split(",")] if _encode_devices else None
+
+# Ingestion encodes this many texts per call, upserting each block while
+# the next one encodes
+ENCODE_BLOCK_SIZE = 1024
+
+# int8 ONNX Runtime model for CPU inference (needs optimum[onnxruntime]);
+# exported once into LOCAL_MODEL_CACHE_DIR on first use
+LOCAL_MODEL_QUANTIZED = os.getenv("LOCAL_MODEL_QUANTIZED", "false").lower() == "true"
+LOCAL_MODEL_CACHE_DIR = Path(__file__).parent / "models"
+
+# Chunk embeddings from earlier ingestion runs, keyed by a hash of the text,
+# so re-runs only encode new or changed chunks (delete to force re-encoding)
+EMBEDDING_CACHE_PATH = Path(__file__).parent / ".embedding_cache.npz"
+
 # ============================================================================
 # Data Pipeline Settings
 # ============================================================================
@@ -82,8 +135,43 @@ ACT_ABBR = "RTA_2006"
 
 # Batch Settings
 UPSERT_BATCH_SIZE = 100
+UPSERT_POOL_THREADS = 30  # Upsert batches in flight at once
+UPSERT_MAX_RETRIES = 3  # Per failed batch (e.g. rate limited), with backoff
+UPSERT_VALUE_DECIMALS = 6  # Vector values are rounded to this (shrinks REST/JSON uploads)
 
-# Ensure output directories exist
-DATA_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-
+# ============================================================================
+# Logging
+# ============================================================================
+# Per-node progress from the LangGraph workflows is logged at INFO/DEBUG;
+# the default keeps request handling quiet
+LOG_LEVEL = os.getenv("LOG_LEVEL", "WARNING").upper()
+
+
+@functools.lru_cache(maxsize=1)
+def configure() -> None:
+    """Apply process-wide setup once; call from entry points, not on import."""
+    logging.basicConfig(
+        level=LOG_LEVEL,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    # Fix LangChain global settings compatibility issue
+    try:
+        from langchain import globals as langchain_globals
+        langchain_globals.set_debug(False)
+        langchain_globals.set_verbose(False)
+    except ImportError:
+        pass
+
+    # Cache LLM responses globally (LangChain checks it on every LLM call)
+    if ENABLE_LLM_CACHE:
+        try:
+            from langchain_core.globals import set_llm_cache
+            from langchain_community.cache import SQLiteCache
+            set_llm_cache(SQLiteCache(database_path=str(LLM_CACHE_PATH)))
+        except ImportError:
+            pass
+
+    # Ensure output directories exist
+    DATA_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Regression check for the fast DOCX reader.
+
+Usage:
+    python check_parser.py [input_file ...]
+
+Parses each document twice, once reading document.xml directly and once
+through unstructured's partition_docx, and fails if the blocks or the
+parsed documents differ. If no input file is specified, uses the default
+from config.py (the bundled Act).
+"""
+
+import sys
+from pathlib import Path
+
+# Add paths for imports
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from parsers.docx_parser import partition_blocks, parse_legal_document
+from data.config import INPUT_DOCX
+
+
+def first_difference(expected, actual, path="document"):
+    """Return the path of the first value that differs, or None if equal."""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        for key in expected.keys() | actual.keys():
+            difference = first_difference(expected.get(key), actual.get(key), f"{path}[{key!r}]")
+            if difference:
+                return difference
+        return None
+
+    if isinstance(expected, (list, tuple)) and isinstance(actual, (list, tuple)):
+        for i, (expected_item, actual_item) in enumerate(zip(expected, actual)):
+            difference = first_difference(expected_item, actual_item, f"{path}[{i}]")
+            if difference:
+                return difference
+        if len(expected) != len(actual):
+            return f"{path} (length {len(expected)} != {len(actual)})"
+        return None
+
+    if expected != actual:
+        return f"{path}: {expected!r} != {actual!r}"
+    return None
+
+
+def check_document(input_path: Path) -> bool:
+    """Compare the fast and partition_docx parses of one document."""
+    print(f"\n📄 {input_path}")
+
+    blocks = partition_blocks(str(input_path))
+    expected_blocks = partition_blocks(str(input_path), fast=False)
+
+    # Blocks with no text are dropped by the parser either way
+    difference = first_difference(
+        [block for block in expected_blocks if block[0].strip()],
+        [block for block in blocks if block[0].strip()],
+        "blocks",
+    )
+    if difference:
+        print(f"  ❌ Blocks differ at {difference}")
+        return False
+    print(f"  ✓ {len(blocks)} blocks match")
+
+    difference = first_difference(
+        parse_legal_document(str(input_path), fast=False),
+        parse_legal_document(str(input_path)),
+    )
+    if difference:
+        print(f"  ❌ Parsed documents differ at {difference}")
+        return False
+    print("  ✓ Parsed documents match")
+
+    return True
+
+
+def main(input_files=None):
+    """Check each input file, returning 1 if any differs."""
+    input_paths = [Path(input_file) for input_file in input_files] if input_files else [INPUT_DOCX]
+
+    print("=" * 70)
+    print("🔍 DOCX READER REGRESSION CHECK")
+    print("=" * 70)
+
+    results = [check_document(input_path) for input_path in input_paths]
+
+    if all(results):
+        print("\n✅ Fast reader matches partition_docx")
+        return 0
+
+    print("\n❌ Fast reader output differs from partition_docx")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,5 +1,6 @@
 """Configuration for legal document parser."""
 
+import functools
 from pathlib import Path
 
 # Directories
@@ -24,5 +25,11 @@ MAX_SECTION_TITLE_LENGTH = 300
 TOKEN_ESTIMATION_RATIO = 4  # 1 token ≈ 4 characters
 LARGE_SECTION_TOKEN_THRESHOLD = 1500
 
-# Ensure output directory exists
-OUTPUT_DIR.mkdir(exist_ok=True)
+# Write pretty-printed raw/clean intermediate files alongside the final output
+DEBUG_WRITE_INTERMEDIATE = False
+
+
+@functools.lru_cache(maxsize=1)
+def configure() -> None:
+    """Create the output directory once; call from entry points, not on import."""
+    OUTPUT_DIR.mkdir(exist_ok=True)
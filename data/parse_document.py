@@ -3,15 +3,23 @@
 Main entry point for parsing legal documents.
 
 Usage:
-    python parse_document.py [input_file]
+    python parse_document.py [input_file ...]
 
-If no input file is specified, uses the default from config.py
+If no input file is specified, uses the default from config.py.
+Several input files are processed in parallel, one process per document,
+each writing <input stem>_final.json to the output directory.
 """
 
 import sys
 import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add paths for imports
 sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -25,6 +33,8 @@ from data.config import (
     OUTPUT_RAW,
     OUTPUT_CLEAN,
     OUTPUT_FINAL,
+    DEBUG_WRITE_INTERMEDIATE,
+    configure,
 )
 
 
@@ -42,6 +52,8 @@ def main(input_file=None):
         print(f"\nExpected location: {INPUT_DOCX}")
         return 1
 
+    configure()
+
     print("=" * 70)
     print("🏛️  LEGAL DOCUMENT PARSER - Modular Pipeline")
     print("=" * 70)
@@ -55,13 +67,20 @@ def main(input_file=None):
     try:
         document = parse_legal_document(str(input_path))
 
-        # Save raw output
-        with open(OUTPUT_RAW, "w", encoding="utf-8") as f:
-            json.dump(document, f, indent=2, ensure_ascii=False)
-
-        print(f"✓ Raw parse complete: {OUTPUT_RAW.name}")
+        # Raw output is only kept on disk for debugging; later stages
+        # receive the document in memory
+        if DEBUG_WRITE_INTERMEDIATE:
+            if orjson is not None:
+                with open(OUTPUT_RAW, "wb", buffering=1 << 20) as f:
+                    f.write(orjson.dumps(document, option=orjson.OPT_INDENT_2))
+            else:
+                with open(OUTPUT_RAW, "wb", buffering=1 << 20) as f:
+                    f.write(json.dumps(document, indent=2, ensure_ascii=False).encode("utf-8"))
+            print(f"✓ Raw parse complete: {OUTPUT_RAW.name}")
+        else:
+            print("✓ Raw parse complete")
         print(f"  - Parts: {len(document['parts'])}")
-        print(f"  - Sections: {sum(len(p['sections']) for p in document['parts'])}")
+        print(f"  - Sections: {document['metadata']['total_sections']}")
 
     except Exception as e:
         print(f"❌ Error during parsing: {e}")
@@ -72,10 +91,10 @@ def main(input_file=None):
     print("-" * 70)
     try:
         document = post_process_document(
-            str(OUTPUT_RAW),
-            str(OUTPUT_CLEAN)
+            document,
+            str(OUTPUT_CLEAN) if DEBUG_WRITE_INTERMEDIATE else None
         )
-        print(f"✓ Post-processing complete: {OUTPUT_CLEAN.name}")
+        print("✓ Post-processing complete")
 
     except Exception as e:
         print(f"❌ Error during post-processing: {e}")
@@ -86,7 +105,7 @@ def main(input_file=None):
     print("-" * 70)
     try:
         document = enhance_document(
-            str(OUTPUT_CLEAN),
+            document,
             str(OUTPUT_FINAL)
         )
         print(f"✓ Enhancement complete: {OUTPUT_FINAL.name}")
@@ -120,8 +139,63 @@ def main(input_file=None):
     return 0
 
 
+def process_one(input_file) -> dict:
+    """Run all three stages on one document and save its final JSON.
+
+    Returns a small summary rather than the document itself, so batch
+    workers don't pickle the whole tree back to the parent process.
+    """
+    input_path = Path(input_file)
+    output_path = OUTPUT_DIR / f"{input_path.stem}_final.json"
+
+    document = parse_legal_document(str(input_path))
+    document = post_process_document(document)
+    document = enhance_document(document, str(output_path))
+
+    return {
+        "output_file": output_path,
+        "act_name": document["act_name"],
+        "total_sections": document["metadata"]["total_sections"],
+    }
+
+
+def main_batch(input_files) -> int:
+    """Run the pipeline over several documents in parallel processes."""
+
+    missing = [f for f in input_files if not Path(f).exists()]
+    if missing:
+        for input_file in missing:
+            print(f"❌ Error: Input file not found: {input_file}")
+        return 1
+
+    configure()
+
+    print("=" * 70)
+    print(f"🏛️  LEGAL DOCUMENT PARSER - Batch of {len(input_files)} documents")
+    print("=" * 70)
+
+    failed = 0
+    with ProcessPoolExecutor() as executor:
+        futures = [executor.submit(process_one, f) for f in input_files]
+        for input_file, future in zip(input_files, futures):
+            try:
+                summary = future.result()
+            except Exception as e:
+                print(f"❌ {input_file}: {e}")
+                failed += 1
+                continue
+
+            print(f"✓ {input_file} → {summary['output_file'].name} "
+                  f"({summary['act_name']}, {summary['total_sections']} sections)")
+
+    return 1 if failed else 0
+
+
 if __name__ == "__main__":
-    # Get input file from command line if provided
-    input_file = sys.argv[1] if len(sys.argv) > 1 else None
+    # Get input file(s) from command line if provided
+    input_files = sys.argv[1:]
+
+    if len(input_files) > 1:
+        sys.exit(main_batch(input_files))
 
-    sys.exit(main(input_file))
+    sys.exit(main(input_files[0] if input_files else None))
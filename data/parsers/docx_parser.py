@@ -1,7 +1,84 @@
-from unstructured.partition.docx import partition_docx
+import functools
 import json
 import re
-from typing import Dict, Any
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, Any, List, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Precompiled patterns (used once or more per document element)
+_RE_AMEND_ENTRY = re.compile(r'[,\s]c\.\s*\d+[,\s]s\.\s*\d+')
+_RE_SPLIT_PART = re.compile(r'(.+?)\s+(PART\s+[IVXLC]+\s*[–-]\s*.+)$', re.IGNORECASE)
+_RE_AMENDMENT = re.compile(
+    r'(\d{4}),\s*c\.\s*(\d+)(?:,\s*(?:s\.|Sched\.)\s*(\d+))?\s*(?:-\s*(\d{2}/\d{2}/\d{4}))?'
+)
+_RE_AMEND_HEADER = re.compile(r'Section Amendments with date in force', re.IGNORECASE)
+_RE_PART_START = re.compile(r'^PART\s+[IVXLC]+', re.IGNORECASE)
+_RE_DEFINITION = re.compile(r'^["""]([^"""]+)["""]?\s+means\s+(.+)$')
+
+# Structural line types, tried in order with one match; the name of the
+# matching alternative is available as match.lastgroup. The single-line
+# "PART I – TITLE" form is checked first by _match_part.
+_RE_LINE = re.compile(
+    r'(?P<schedule>(?i:SCHEDULE\s+(?P<schedule_id>[A-Z0-9]+)\s*[–-]?\s*(?P<schedule_title>.*))$)'
+    r'|(?P<part_multiline>(?i:part\s+(?P<part_multiline_number>[ivxlc]+|[\d]+)\s*[\n\r]+\s*(?P<part_multiline_title>.+))$)'
+    r'|(?P<part_number_only>(?i:part\s+(?P<part_number>[ivxlc]+|[\d]+)\s*)$)'
+    r'|(?P<section>(?:Section\s+)?(?P<section_number>\d+)\.?\s*(?P<section_title>.*)$)'
+    r'|(?P<subsection>\((?P<subsection_number>\d+)\)\s*(?P<subsection_text>.*)$)'
+    r'|(?P<paragraph>\((?P<paragraph_label>(?i:[a-z]))\)\s*(?P<paragraph_text>.*)$)'
+)
+
+# Punctuation stripped around titles and citations: commas, dashes and every
+# character str.isspace() accepts (the same set as regex \s)
+_EDGE_PUNCT_CHARS = (
+    ",-–—"
+    "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004"
+    "\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000"
+)
+
+# WordprocessingML tags read by _fast_partition_docx
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_DOCUMENT = _W + "document"
+_W_BODY = _W + "body"
+_W_P = _W + "p"
+_W_R = _W + "r"
+_W_HYPERLINK = _W + "hyperlink"
+_W_TBL = _W + "tbl"
+_W_TR = _W + "tr"
+_W_TC = _W + "tc"
+_W_TC_PR = _W + "tcPr"
+_W_V_MERGE = _W + "vMerge"
+_W_T = _W + "t"
+_W_BR = _W + "br"
+_W_PAGE_BREAK = _W + "lastRenderedPageBreak"
+_W_VAL = _W + "val"
+_W_TYPE = _W + "type"
+
+# Run content read as text, as python-docx does (w:br is handled separately:
+# only line breaks are text, page and column breaks are not)
+_W_RUN_TEXT = {
+    _W + "tab": "\t",
+    _W + "ptab": "\t",
+    _W + "cr": "\n",
+    _W + "noBreakHyphen": "-",
+}
+
+# Header/footer parts with any text run
+_RE_HEADER_FOOTER_PART = re.compile(r'word/(?:header|footer)\d*\.xml')
+_RE_XML_TEXT_RUN = re.compile(rb'<w:t[ >]')
+
+# Characters allowed in a PART number written in Roman numerals
+_ROMAN_NUMERAL_CHARS = frozenset("IVXLCivxlc")
+_PART_START_CHARS = frozenset("Pp")
+
+# First characters _RE_LINE and _RE_DEFINITION can match (digit, "(", S/s for
+# Section/SCHEDULE, P/p for PART; a quote for definitions)
+_LINE_START_CHARS = frozenset("0123456789(SsPp")
+_DEFINITION_START_CHARS = frozenset('"')
 
 
 def is_amendment_entry(text: str, section_number: str) -> bool:
@@ -10,7 +87,7 @@ def is_amendment_entry(text: str, section_number: str) -> bool:
     if len(section_number) == 4 and section_number.isdigit():
         return True
     # Check for amendment patterns like ", c. 3, s. 20"
-    if re.search(r'[,\s]c\.\s*\d+[,\s]s\.\s*\d+', text):
+    if _RE_AMEND_ENTRY.search(text):
         return True
     return False
 
@@ -18,14 +95,50 @@ def is_amendment_entry(text: str, section_number: str) -> bool:
 def clean_section_title(title: str) -> str:
     """Clean up section title by removing leading punctuation."""
     # Remove leading commas, spaces, dashes
-    title = re.sub(r'^[,\s\-–—]+', '', title)
-    return title.strip()
+    return title.lstrip(_EDGE_PUNCT_CHARS).strip()
+
+
+def _match_part(text: str) -> tuple[str, str] | None:
+    """
+    Match a single-line PART heading (e.g., "PART I – INTRODUCTION").
+
+    String-scanning equivalent of r'^PART\s+([IVXLC]+|\d+)\s*[–-]\s*(.+)$'
+    (case-insensitive). Returns (number, title) or None.
+    """
+    if text[:4].upper() != "PART":
+        return None
+
+    rest = text[4:]
+    number_text = rest.lstrip()
+    if len(number_text) == len(rest):
+        return None  # "PART" must be followed by whitespace
+
+    # Number is a run of Roman numeral characters or of digits
+    end = 0
+    if number_text[:1] in _ROMAN_NUMERAL_CHARS:
+        while end < len(number_text) and number_text[end] in _ROMAN_NUMERAL_CHARS:
+            end += 1
+    else:
+        while end < len(number_text) and number_text[end].isdecimal():
+            end += 1
+    if not end:
+        return None
+
+    rest = number_text[end:].lstrip()
+    if rest[:1] not in ("–", "-"):
+        return None
+
+    title = rest[1:].lstrip()
+    if not title or "\n" in title:
+        return None
+
+    return number_text[:end], title
 
 
 def split_merged_content(text: str) -> tuple[str, str | None]:
     """Split text if it contains merged PART declarations."""
     # Look for patterns like "...text. PART II – TITLE"
-    match = re.search(r'(.+?)\s+(PART\s+[IVXLC]+\s*[–-]\s*.+)$', text, re.IGNORECASE)
+    match = _RE_SPLIT_PART.search(text)
     if match:
         return match.group(1).strip(), match.group(2).strip()
     return text, None
@@ -36,15 +149,27 @@ def extract_amendment_info(text: str) -> tuple[str, dict | None]:
     Extract amendment citation from text.
     Returns: (cleaned_text, amendment_dict or None)
 
+    Results are memoized on the input text (the same citations recur across
+    many sections); each call gets its own amendment dict.
+    """
+    cleaned_text, amendment_items = _extract_amendment_info(text)
+    if amendment_items is None:
+        return cleaned_text, None
+    return cleaned_text, dict(amendment_items)
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_amendment_info(text: str) -> tuple[str, tuple[tuple[str, str], ...] | None]:
+    """
+    Memoized worker for extract_amendment_info.
+    Returns: (cleaned_text, amendment (key, value) pairs or None)
+
     Patterns:
     - "2013, c. 3, s. 20 - 01/06/2014"
     - "2024, c. 28, Sched. 24."
     - "Section Amendments with date in force (d/m/y)"
     """
-    # Pattern for amendment citations
-    amendment_pattern = r'(\d{4}),\s*c\.\s*(\d+)(?:,\s*(?:s\.|Sched\.)\s*(\d+))?\s*(?:-\s*(\d{2}/\d{2}/\d{4}))?'
-
-    match = re.search(amendment_pattern, text)
+    match = _RE_AMENDMENT.search(text)
     if match:
         year = match.group(1)
         chapter = match.group(2)
@@ -70,21 +195,195 @@ def extract_amendment_info(text: str) -> tuple[str, dict | None]:
         # Remove amendment from text
         cleaned_text = text[:match.start()].strip()
         # Also remove trailing punctuation/whitespace
-        cleaned_text = re.sub(r'[,\s\-–—]+$', '', cleaned_text).strip()
+        cleaned_text = cleaned_text.rstrip(_EDGE_PUNCT_CHARS).strip()
 
-        return cleaned_text, amendment_info
+        return cleaned_text, tuple(amendment_info.items())
 
     # Check for amendment header text
-    if re.search(r'Section Amendments with date in force', text, re.IGNORECASE):
+    if _RE_AMEND_HEADER.search(text):
         return "", None  # Skip these header lines
 
     return text, None
 
 
-def parse_legal_document(file_path: str) -> Dict[str, Any]:
-    """Parse a legal document (DOCX) into hierarchical JSON structure."""
+def _join_text_buffers(document: Dict[str, Any]) -> None:
+    """
+    Join the per-field text buffers built during parsing into strings.
+
+    Section and subsection buffers only ever hold stripped, non-empty lines,
+    so the joined text needs no further stripping.
+    """
+    for schedule in document["schedules"]:
+        schedule["content"] = " ".join(schedule["content"])
+
+    for part in document["parts"]:
+        if "description" in part:
+            part["description"] = " ".join(part["description"])
+
+        for section in part["sections"]:
+            section["section_text"] = " ".join(section["section_text"])
+            for subsection in section["subsections"]:
+                subsection["subsection_text"] = " ".join(subsection["subsection_text"])
+                for paragraph in subsection["paragraphs"]:
+                    paragraph["text"] = " ".join(paragraph["text"])
+
+
+def _fast_partition_docx(file_path: str) -> List[Tuple[str, bool]] | None:
+    """
+    Stream word/document.xml and return (text, is_table) per top-level block.
 
-    elements = partition_docx(file_path, strategy="fast")
+    Only the text and table flag are needed by the parser, so this skips
+    building unstructured's element objects, while reading text the same
+    way partition_docx does:
+
+    - A body paragraph is split at each w:lastRenderedPageBreak; a break
+      inside a hyperlink splits after the whole hyperlink.
+    - Paragraph text comes from its own runs (directly or in a hyperlink);
+      w:br counts as "\\n" only for line breaks.
+    - A table is the stripped, non-empty text of each cell paragraph joined
+      by spaces, skipping vertically merged continuation cells.
+
+    Returns None if the file doesn't look like a regular WordprocessingML
+    document, or has header/footer text (which partition_docx also emits).
+    """
+    blocks = []
+    stack = []  # Tags of the open elements, document first
+    paragraph_depths = []  # Stack index of each paragraph collecting text
+    buffer = []  # Text of the innermost collecting paragraph
+    table_texts = []  # Cell paragraph texts of the current body-level table
+    skipped_cell_depth = None  # Stack index of a merged continuation cell
+    split_after_hyperlink = False
+
+    def end_fragment() -> None:
+        blocks.append(("".join(buffer), False))
+        buffer.clear()
+
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            for name in archive.namelist():
+                if _RE_HEADER_FOOTER_PART.fullmatch(name) and _RE_XML_TEXT_RUN.search(archive.read(name)):
+                    return None
+
+            with archive.open("word/document.xml") as xml_file:
+                events = ET.iterparse(xml_file, events=("start", "end"))
+
+                _, root = next(events)
+                if root.tag != _W_DOCUMENT:
+                    return None
+                stack.append(root.tag)
+
+                for event, elem in events:
+                    tag = elem.tag
+
+                    if event == "start":
+                        stack.append(tag)
+                        depth = len(stack) - 1
+
+                        if tag == _W_P and (
+                            # Body paragraph, or a paragraph directly in a table cell
+                            depth == 2
+                            or (stack[-2] == _W_TC and stack[-3] == _W_TR and stack[-4] == _W_TBL)
+                        ):
+                            paragraph_depths.append(depth)
+                        elif (
+                            tag == _W_V_MERGE
+                            and stack[-2] == _W_TC_PR
+                            and skipped_cell_depth is None
+                            and elem.get(_W_VAL, "continue") == "continue"
+                        ):
+                            skipped_cell_depth = depth - 2
+                        continue
+
+                    depth = len(stack) - 1
+                    stack.pop()
+
+                    if paragraph_depths and depth >= 2 and stack[-1] == _W_R:
+                        # Run content counts if the run belongs to the collecting
+                        # paragraph, directly or through a hyperlink
+                        run_parent = depth - 2
+                        paragraph_depth = paragraph_depths[-1]
+                        if run_parent == paragraph_depth or (
+                            run_parent == paragraph_depth + 1 and stack[-2] == _W_HYPERLINK
+                        ):
+                            if tag == _W_T:
+                                if elem.text:
+                                    buffer.append(elem.text)
+                            elif tag == _W_BR:
+                                if elem.get(_W_TYPE, "textWrapping") == "textWrapping":
+                                    buffer.append("\n")
+                            elif tag in _W_RUN_TEXT:
+                                buffer.append(_W_RUN_TEXT[tag])
+                            elif tag == _W_PAGE_BREAK and paragraph_depth == 2:
+                                if run_parent == paragraph_depth:
+                                    end_fragment()
+                                else:
+                                    split_after_hyperlink = True
+                        continue
+
+                    if tag == _W_HYPERLINK and depth == 3 and split_after_hyperlink:
+                        split_after_hyperlink = False
+                        end_fragment()
+                    elif tag == _W_P and paragraph_depths and paragraph_depths[-1] == depth:
+                        paragraph_depths.pop()
+                        if depth == 2:
+                            end_fragment()
+                            elem.clear()
+                        else:
+                            text = "".join(buffer).strip()
+                            buffer.clear()
+                            if text and skipped_cell_depth is None:
+                                table_texts.append(text)
+                    elif tag == _W_TC and depth == skipped_cell_depth:
+                        skipped_cell_depth = None
+                    elif tag == _W_TBL and depth == 2:
+                        blocks.append((" ".join(table_texts), True))
+                        table_texts.clear()
+                        elem.clear()
+    except (KeyError, StopIteration, ET.ParseError, zipfile.BadZipFile):
+        return None
+
+    return blocks
+
+
+def partition_blocks(file_path: str, fast: bool = True) -> List[Tuple[str, bool]]:
+    """
+    Return (text, is_table) for each top-level block of a DOCX file.
+
+    Args:
+        file_path: Path to the DOCX file
+        fast: Read document.xml directly when its layout allows (same
+            blocks as partition_docx, see _fast_partition_docx); False always
+            uses unstructured's partition_docx
+    """
+    blocks = _fast_partition_docx(file_path) if fast else None
+    if blocks is None:
+        # Unexpected layout, use unstructured's full partitioner instead
+        from unstructured.partition.docx import partition_docx
+
+        elements = partition_docx(file_path, strategy="fast")
+        blocks = [(element.text, element.category == "Table") for element in elements]
+
+    return blocks
+
+
+def parse_legal_document(file_path: str, fast: bool = True) -> Dict[str, Any]:
+    """Parse a legal document (DOCX) into hierarchical JSON structure.
+
+    Args:
+        file_path: Path to the DOCX file
+        fast: Passed to partition_blocks (False parses through partition_docx)
+    """
+
+    blocks = partition_blocks(file_path, fast)
+
+    # Keep only non-empty lines, skipping the table of contents (appears as
+    # a large Table element), so the state machine below sees real content
+    lines = [
+        text
+        for block_text, is_table in blocks
+        if (text := block_text.strip())
+        and not (is_table and len(text) > 1000)
+    ]
 
     # Initialize the document structure
     document = {
@@ -96,7 +395,8 @@ def parse_legal_document(file_path: str) -> Dict[str, Any]:
         "parts": [],
         "definitions": [],
         "schedules": [],
-        "amendments": []  # Store amendment entries separately
+        "amendments": [],  # Store amendment entries separately
+        "metadata": {},  # Structural counts, filled in as the tree is built
     }
 
     current_part = None
@@ -105,26 +405,22 @@ def parse_legal_document(file_path: str) -> Dict[str, Any]:
     current_schedule = None
     pending_part_text = None  # Store split PART text
     pending_part_number = None  # Store PART number when title comes on next line
+    total_sections = 0
+    total_subsections = 0
 
-    for element in elements:
-        text = element.text.strip()
-        if not text:
-            continue
-
-        # Skip table of contents (appears as large Table element)
-        if element.category == "Table" and len(text) > 1000:
-            continue
-
+    for text in lines:
         # Check if we have pending PART text from previous split
         if pending_part_text:
             text = pending_part_text
             pending_part_text = None
 
+        text_len = len(text)
+
         # Detect Act metadata (title, citation)
-        if not document["act_name"] and ("Act" in text or "S.O." in text):
-            if "S.O." in text and len(text) < 300:
+        if not document["act_name"]:
+            if text_len < 300 and "S.O." in text:
                 document["citation"] = text
-            if len(text) < 200 and "Act" in text and "PART" not in text.upper():
+            if text_len < 200 and "Act" in text and "PART" not in text.upper():
                 document["act_name"] = text
 
         # Detect consolidation/amendment info
@@ -134,13 +430,22 @@ def parse_legal_document(file_path: str) -> Dict[str, Any]:
             elif "amendment" in text:
                 document["last_amendment"] = text
 
+        # Classify the line by its leading structure (None for plain text)
+        first_char = text[0]
+        part_match = _match_part(text) if first_char in _PART_START_CHARS else None
+        if part_match:
+            line_match = None
+            line_kind = "part_dash"
+        else:
+            line_match = _RE_LINE.match(text) if first_char in _LINE_START_CHARS else None
+            line_kind = line_match.lastgroup if line_match else None
+
         # Detect SCHEDULE (e.g., "SCHEDULE A", "SCHEDULE 1")
-        schedule_match = re.match(r'^SCHEDULE\s+([A-Z0-9]+)\s*[–-]?\s*(.*)$', text, re.IGNORECASE)
-        if schedule_match:
+        if line_kind == "schedule":
             current_schedule = {
-                "schedule_id": schedule_match.group(1),
-                "schedule_title": schedule_match.group(2).strip(),
-                "content": ""
+                "schedule_id": line_match.group("schedule_id"),
+                "schedule_title": line_match.group("schedule_title").strip(),
+                "content": []
             }
             document["schedules"].append(current_schedule)
             current_part = None
@@ -151,10 +456,10 @@ def parse_legal_document(file_path: str) -> Dict[str, Any]:
         # If we're in a schedule, append content (but check for PART)
         if current_schedule:
             # Check if PART starts within schedule
-            if re.match(r'^PART\s+[IVXLC]+', text, re.IGNORECASE):
+            if _RE_PART_START.match(text):
                 current_schedule = None
             else:
-                current_schedule["content"] += " " + text
+                current_schedule["content"].append(text)
                 continue
 
         # Detect PART - handles multiple formats:
@@ -178,11 +483,10 @@ def parse_legal_document(file_path: str) -> Dict[str, Any]:
             continue
 
         # Check for single-line PART with dash (e.g., "PART I – INTRODUCTION")
-        part_match = re.match(r'^PART\s+([IVXLC]+|[\d]+)\s*[–-]\s*(.+)$', text, re.IGNORECASE)
-        if part_match:
+        if line_kind == "part_dash":
             current_part = {
-                "part_number": part_match.group(1).upper(),
-                "part_title": part_match.group(2).strip().upper(),
+                "part_number": part_match[0].upper(),
+                "part_title": part_match[1].strip().upper(),
                 "sections": []
             }
             document["parts"].append(current_part)
@@ -192,11 +496,10 @@ def parse_legal_document(file_path: str) -> Dict[str, Any]:
             continue
 
         # Check for multi-line PART within same element (e.g., "part i\nintroduction")
-        multiline_part_match = re.match(r'^part\s+([ivxlc]+|[\d]+)\s*[\n\r]+\s*(.+)$', text, re.IGNORECASE)
-        if multiline_part_match:
+        if line_kind == "part_multiline":
             current_part = {
-                "part_number": multiline_part_match.group(1).upper(),
-                "part_title": multiline_part_match.group(2).strip().upper(),
+                "part_number": line_match.group("part_multiline_number").upper(),
+                "part_title": line_match.group("part_multiline_title").strip().upper(),
                 "sections": []
             }
             document["parts"].append(current_part)
@@ -206,24 +509,25 @@ def parse_legal_document(file_path: str) -> Dict[str, Any]:
             continue
 
         # Check for PART number only (title will come in next element)
-        part_number_only = re.match(r'^part\s+([ivxlc]+|[\d]+)\s*$', text, re.IGNORECASE)
-        if part_number_only:
-            pending_part_number = part_number_only.group(1).upper()
+        if line_kind == "part_number_only":
+            pending_part_number = line_match.group("part_number").upper()
             continue
 
         # Skip "Section Amendments with date in force" headers
-        if re.search(r'Section Amendments with date in force', text, re.IGNORECASE):
+        if _RE_AMEND_HEADER.search(text):
             continue
 
         # Skip standalone amendment lines (these are metadata, not content)
         # Pattern: Just an amendment citation with no other content
         _, potential_amendment = extract_amendment_info(text)
-        if potential_amendment and len(text) < 100:
+        if potential_amendment and text_len < 100:
             # This is likely a standalone amendment line, skip it
             continue
 
         # Detect definitions (e.g., ""landlord" means...")
-        definition_match = re.match(r'^["""]([^"""]+)["""]?\s+means\s+(.+)$', text)
+        definition_match = (
+            _RE_DEFINITION.match(text) if first_char in _DEFINITION_START_CHARS else None
+        )
         if definition_match:
             term = definition_match.group(1).strip()
             definition = definition_match.group(2).strip()
@@ -234,10 +538,9 @@ def parse_legal_document(file_path: str) -> Dict[str, Any]:
             continue
 
         # Detect Section (e.g., "1. Purposes of Act" or "Section 1")
-        section_match = re.match(r'^(?:Section\s+)?(\d+)\.?\s*(.*)$', text)
-        if section_match and len(text) < 300:  # Increased limit
-            section_number = section_match.group(1)
-            section_title = section_match.group(2).strip()
+        if line_kind == "section" and text_len < 300:  # Increased limit
+            section_number = line_match.group("section_number")
+            section_title = line_match.group("section_title").strip()
 
             # Check if this is an amendment entry
             if is_amendment_entry(text, section_number):
@@ -266,7 +569,7 @@ def parse_legal_document(file_path: str) -> Dict[str, Any]:
             current_section = {
                 "section_number": section_number,
                 "section_title": section_title,
-                "section_text": "",
+                "section_text": [],
                 "subsections": []
             }
 
@@ -275,21 +578,21 @@ def parse_legal_document(file_path: str) -> Dict[str, Any]:
                 current_section["amendment_info"] = amendment_info
 
             current_part["sections"].append(current_section)
+            total_sections += 1
             current_subsection = None
             continue
 
         # Detect Subsection (e.g., "(1)", "(2)")
-        subsection_match = re.match(r'^\((\d+)\)\s*(.*)$', text)
-        if subsection_match and current_section:
-            subsection_number = subsection_match.group(1)
-            subsection_text = subsection_match.group(2).strip()
+        if line_kind == "subsection" and current_section:
+            subsection_number = line_match.group("subsection_number")
+            subsection_text = line_match.group("subsection_text").strip()
 
             # Extract amendment info from subsection text if present
             subsection_text, amendment_info = extract_amendment_info(subsection_text)
 
             current_subsection = {
                 "subsection_number": f"({subsection_number})",
-                "subsection_text": subsection_text,
+                "subsection_text": [subsection_text] if subsection_text else [],
                 "paragraphs": []
             }
 
@@ -298,17 +601,17 @@ def parse_legal_document(file_path: str) -> Dict[str, Any]:
                 current_subsection["amendment_info"] = amendment_info
 
             current_section["subsections"].append(current_subsection)
+            total_subsections += 1
             continue
 
         # Detect Paragraph (e.g., "(a)", "(b)")
-        paragraph_match = re.match(r'^\(([a-z])\)\s*(.*)$', text, re.IGNORECASE)
-        if paragraph_match and current_subsection:
-            paragraph_label = paragraph_match.group(1)
-            paragraph_text = paragraph_match.group(2).strip()
+        if line_kind == "paragraph" and current_subsection:
+            paragraph_label = line_match.group("paragraph_label")
+            paragraph_text = line_match.group("paragraph_text").strip()
 
             current_subsection["paragraphs"].append({
                 "label": f"({paragraph_label})",
-                "text": paragraph_text
+                "text": [paragraph_text]
             })
             continue
 
@@ -320,33 +623,31 @@ def parse_legal_document(file_path: str) -> Dict[str, Any]:
             pending_part_text = split_part
             text = main_text
 
-        # Append text to appropriate context
+        # Append text to appropriate context (text fields are buffered as
+        # lists while parsing and joined once in _join_text_buffers)
         if current_subsection:
             # Add to last paragraph or subsection text
             if current_subsection["paragraphs"]:
-                current_subsection["paragraphs"][-1]["text"] += " " + text
+                current_subsection["paragraphs"][-1]["text"].append(text)
             else:
-                current_subsection["subsection_text"] += " " + text
+                current_subsection["subsection_text"].append(text)
         elif current_section:
             if not current_section["subsections"]:
-                current_section["section_text"] += " " + text
+                current_section["section_text"].append(text)
             else:
                 # Append to last subsection
-                current_section["subsections"][-1]["subsection_text"] += " " + text
+                current_section["subsections"][-1]["subsection_text"].append(text)
         elif current_part:
             # Content without section (rare, but possible)
             if not current_part["sections"]:
-                if "description" not in current_part:
-                    current_part["description"] = text
-                else:
-                    current_part["description"] += " " + text
+                current_part.setdefault("description", []).append(text)
 
-    # Post-process: clean up empty text fields
-    for part in document["parts"]:
-        for section in part["sections"]:
-            section["section_text"] = section["section_text"].strip()
-            for subsection in section["subsections"]:
-                subsection["subsection_text"] = subsection["subsection_text"].strip()
+    _join_text_buffers(document)
+
+    document["metadata"].update({
+        "total_sections": total_sections,
+        "total_subsections": total_subsections,
+    })
 
     return document
 
@@ -359,16 +660,19 @@ def main():
 
     # Save to JSON
     output_file = "parsed_output.json"
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(structured_data, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        with open(output_file, "wb", buffering=1 << 20) as f:
+            f.write(orjson.dumps(structured_data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, "wb", buffering=1 << 20) as f:
+            f.write(json.dumps(structured_data, indent=2, ensure_ascii=False).encode("utf-8"))
 
     print(f"✓ Parsed document saved to {output_file}")
     print(f"  - Act: {structured_data['act_name']}")
     print(f"  - Citation: {structured_data['citation']}")
     print(f"  - Parts: {len(structured_data['parts'])}")
 
-    total_sections = sum(len(part['sections']) for part in structured_data['parts'])
-    print(f"  - Total Sections: {total_sections}")
+    print(f"  - Total Sections: {structured_data['metadata']['total_sections']}")
 
     # Show part breakdown
     for part in structured_data['parts']:
@@ -2,101 +2,110 @@
 
 import json
 import re
-from typing import Dict, Any, List
+import sys
+from bisect import bisect_right
+from typing import Dict, Any
 
+try:
+    from .output_cache import load_json, load_if_unchanged, write_bytes, write_stamp
+except ImportError:
+    # Run as a script (python enhancer.py), not as part of the parsers package
+    from output_cache import load_json, load_if_unchanged, write_bytes, write_stamp
 
-def add_hierarchical_section_ids(document: Dict[str, Any]) -> None:
-    """
-    Add hierarchical section IDs in format: PART.SECTION
-    Example: "I.1", "II.5", "V.47"
-
-    This prevents confusion when multiple parts have section "1".
-    """
-    for part in document["parts"]:
-        part_number = part["part_number"]
-
-        for section in part["sections"]:
-            section_number = section["section_number"]
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-            # Add hierarchical ID
-            section["section_id"] = f"{part_number}.{section_number}"
 
-            # Add hierarchical subsection IDs
-            for subsection in section.get("subsections", []):
-                subsection_number = subsection["subsection_number"]
-                subsection["subsection_id"] = f"{part_number}.{section_number}.{subsection_number}"
+# "English term" ... ("French term"), e.g.
+# "Board" means the Landlord and Tenant Board; ("Commission")
+# Run once per part over the section texts joined with _SECTION_SEPARATOR,
+# which the pattern can't match across (it can't occur in DOCX text: XML
+# doesn't allow that control character)
+_SECTION_SEPARATOR = "\x1f"
+_RE_BILINGUAL_TERM = re.compile(r'"([^"\x1f]+)"[^(\x1f]*\("([^)\x1f]+)"\)')
 
 
-def extract_bilingual_terms(document: Dict[str, Any]) -> None:
+def enhance_all(document: Dict[str, Any]) -> None:
     """
-    Extract French terms that appear in parentheses.
-    Pattern: "term" ... ("French term")
+    Add all RAG enhancements in a single walk over the parts tree:
+
+    - Hierarchical IDs in format PART.SECTION(.SUBSECTION), e.g. "I.1",
+      "V.47.(2)", so sections "1" in different parts don't collide
+    - Bilingual (English/French) terms found in section text
+    - Token count estimates (rough: 1 token ≈ 4 UTF-8 bytes, which tracks
+      tokenizers better than characters for accented French text), flagging
+      sections over 1500 tokens for chunking
+    - Part-level summaries and counts
+    - Document-level retrieval metadata
     """
     bilingual_terms = []
+    chunking_recommendations = []
+    total_sections = 0
+    total_subsections = 0
+    total_text = 0
+    total_bytes = 0
 
     for part in document["parts"]:
-        for section in part["sections"]:
-            # Search in section text
-            text = section.get("section_text", "")
-
-            # Pattern: "English term" ... ("French term")
-            # Example: "Board" means the Landlord and Tenant Board; ("Commission")
-            matches = re.findall(r'"([^"]+)"[^(]*\("([^)]+)"\)', text)
-
-            for english, french in matches:
-                bilingual_terms.append({
-                    "english": english.strip(),
-                    "french": french.strip(),
-                    "section_id": section.get("section_id", f"{part['part_number']}.{section['section_number']}")
-                })
-
-    # Add to document
-    document["bilingual_terms"] = bilingual_terms
+        part_number = part["part_number"]
+        sections = part.get("sections", [])
+        part_subsections = 0
 
+        # Section texts of this part and where each starts once joined
+        section_texts = []
+        section_offsets = []
+        section_ids = []
+        offset = 0
 
-def estimate_token_counts(document: Dict[str, Any]) -> None:
-    """
-    Add token count estimates (rough: 1 token ≈ 4 chars).
-    Flag sections > 1500 tokens for chunking.
-    """
-    chunking_recommendations = []
+        for section in sections:
+            section_number = section["section_number"]
+            section_id = f"{part_number}.{section_number}"
+            section["section_id"] = section_id
 
-    for part in document["parts"]:
-        for section in part["sections"]:
             section_text = section.get("section_text", "")
+            section_chars = len(section_text)
+            section_bytes = len(section_text.encode("utf-8"))
+            total_text += section_chars
+            total_bytes += section_bytes
+
+            section_texts.append(section_text)
+            section_offsets.append(offset)
+            section_ids.append(section_id)
+            offset += section_chars + 1
 
             # Rough token estimate
-            estimated_tokens = len(section_text) // 4
+            estimated_tokens = section_bytes >> 2
             section["estimated_tokens"] = estimated_tokens
+            section["char_count"] = section_chars
 
             # If section is large, recommend chunking
             if estimated_tokens > 1500:
                 chunking_recommendations.append({
-                    "section_id": section.get("section_id"),
-                    "section_number": section["section_number"],
+                    "section_id": section_id,
+                    "section_number": section_number,
                     "section_title": section["section_title"],
                     "estimated_tokens": estimated_tokens,
                     "recommendation": "Split by subsections for better retrieval"
                 })
 
-            # Add token counts to subsections
-            for subsection in section.get("subsections", []):
-                subsection_text = subsection.get("subsection_text", "")
-                subsection["estimated_tokens"] = len(subsection_text) // 4
-
-    # Add chunking recommendations to metadata
-    if chunking_recommendations:
-        if "metadata" not in document:
-            document["metadata"] = {}
-        document["metadata"]["chunking_recommendations"] = chunking_recommendations
-
+            subsections = section.get("subsections", [])
+            part_subsections += len(subsections)
 
-def add_part_summaries(document: Dict[str, Any]) -> None:
-    """
-    Add part-level summaries based on first few sections.
-    """
-    for part in document["parts"]:
-        sections = part.get("sections", [])
+            for subsection in subsections:
+                subsection["subsection_id"] = f"{section_id}.{subsection['subsection_number']}"
+                subsection_text = subsection.get("subsection_text", "")
+                subsection["estimated_tokens"] = len(subsection_text.encode("utf-8")) >> 2
+                subsection["char_count"] = len(subsection_text)
+
+        # Extract bilingual terms in one scan over the part's section texts
+        for match in _RE_BILINGUAL_TERM.finditer(_SECTION_SEPARATOR.join(section_texts)):
+            english, french = match.groups()
+            bilingual_terms.append({
+                "english": english.strip(),
+                "french": french.strip(),
+                "section_id": section_ids[bisect_right(section_offsets, match.start()) - 1]
+            })
 
         # Get first section title as part summary hint
         if sections:
@@ -105,84 +114,93 @@ def add_part_summaries(document: Dict[str, Any]) -> None:
 
         # Count statistics
         part["total_sections"] = len(sections)
-        part["total_subsections"] = sum(len(s.get("subsections", [])) for s in sections)
+        part["total_subsections"] = part_subsections
+        total_sections += len(sections)
+        total_subsections += part_subsections
 
+    document["bilingual_terms"] = bilingual_terms
 
-def add_retrieval_metadata(document: Dict[str, Any]) -> None:
-    """
-    Add metadata useful for RAG retrieval.
-    """
-    # Overall statistics
-    total_sections = sum(len(part['sections']) for part in document['parts'])
-    total_subsections = sum(
-        len(section.get('subsections', []))
-        for part in document['parts']
-        for section in part['sections']
-    )
-
-    total_text = sum(
-        len(section.get('section_text', ''))
-        for part in document['parts']
-        for section in part['sections']
-    )
-
-    if "metadata" not in document:
-        document["metadata"] = {}
-
-    document["metadata"].update({
+    metadata = document.setdefault("metadata", {})
+    if chunking_recommendations:
+        metadata["chunking_recommendations"] = chunking_recommendations
+
+    metadata.update({
         "total_parts": len(document["parts"]),
         "total_sections": total_sections,
         "total_subsections": total_subsections,
         "total_characters": total_text,
-        "estimated_total_tokens": total_text // 4,
+        "estimated_total_tokens": total_bytes >> 2,
         "recommended_chunk_strategy": "section or subsection level",
         "optimal_for": ["semantic search", "RAG retrieval", "legal citation lookup"]
     })
 
 
-def enhance_document(input_file: str, output_file: str) -> Dict[str, Any]:
-    """Apply all enhancements."""
+def enhance_document(document: Dict[str, Any] | str, output_file: str) -> Dict[str, Any]:
+    """Apply all enhancements.
+
+    A document dict is enhanced in place and returned.
 
-    print(f"Loading {input_file}...")
-    with open(input_file, "r", encoding="utf-8") as f:
-        document = json.load(f)
+    Args:
+        document: Cleaned document dict, or path to its JSON file (if that
+            file is unchanged since output_file was written, the saved
+            output is returned instead)
+        output_file: Where to save the enhanced document
+    """
+
+    input_file = None
+    if not isinstance(document, dict):
+        input_file = document
+        if output_file:
+            saved = load_if_unchanged(input_file, output_file, __file__)
+            if saved is not None:
+                print(f"✓ {input_file} unchanged since {output_file} was written, skipping")
+                return saved
+
+        print(f"Loading {input_file}...")
+        document = load_json(input_file)
 
     print("\n🔧 Applying enhancements...")
 
+    # All five enhancements are applied in a single tree walk
     print("  1. Adding hierarchical section IDs (Part.Section format)...")
-    add_hierarchical_section_ids(document)
-
     print("  2. Extracting bilingual terms (English/French)...")
-    extract_bilingual_terms(document)
-
     print("  3. Estimating token counts and chunking needs...")
-    estimate_token_counts(document)
-
     print("  4. Adding part-level summaries...")
-    add_part_summaries(document)
-
     print("  5. Adding retrieval metadata...")
-    add_retrieval_metadata(document)
+    enhance_all(document)
 
     # Save enhanced document
     print(f"\n💾 Saving enhanced document to {output_file}...")
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(document, f, indent=2, ensure_ascii=False)
-
-    # Print statistics
-    print("\n📊 Enhancement Summary:")
-    print(f"  ✓ Hierarchical section IDs added to {document['metadata']['total_sections']} sections")
-    print(f"  ✓ Bilingual terms extracted: {len(document.get('bilingual_terms', []))}")
-    print(f"  ✓ Token counts estimated for all sections/subsections")
-
-    chunking_recs = document.get("metadata", {}).get("chunking_recommendations", [])
+    if orjson is not None:
+        write_bytes(output_file, orjson.dumps(document))
+    else:
+        write_bytes(output_file, json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    if input_file:
+        write_stamp(input_file, output_file, __file__)
+
+    # Print statistics (collected and written to stdout in one call)
+    metadata = document["metadata"]
+    summary_lines = [
+        "",
+        "📊 Enhancement Summary:",
+        f"  ✓ Hierarchical section IDs added to {metadata['total_sections']} sections",
+        f"  ✓ Bilingual terms extracted: {len(document.get('bilingual_terms', []))}",
+        "  ✓ Token counts estimated for all sections/subsections",
+    ]
+
+    chunking_recs = metadata.get("chunking_recommendations", [])
     if chunking_recs:
-        print(f"  ⚠ Large sections needing chunking: {len(chunking_recs)}")
+        summary_lines.append(f"  ⚠ Large sections needing chunking: {len(chunking_recs)}")
     else:
-        print(f"  ✓ All sections within optimal size (<1500 tokens)")
-
-    print(f"\n  Total estimated tokens: {document['metadata']['estimated_total_tokens']:,}")
-    print(f"  Recommended strategy: {document['metadata']['recommended_chunk_strategy']}")
+        summary_lines.append("  ✓ All sections within optimal size (<1500 tokens)")
+
+    summary_lines += [
+        "",
+        f"  Total estimated tokens: {metadata['estimated_total_tokens']:,}",
+        f"  Recommended strategy: {metadata['recommended_chunk_strategy']}",
+    ]
+    sys.stdout.write("\n".join(summary_lines) + "\n")
 
     return document
 
@@ -0,0 +1,73 @@
+"""Stage output helpers: JSON loading, raw writes and skipping unchanged inputs."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def load_json(path: str) -> Dict[str, Any]:
+    """Load a JSON document (with orjson when available)."""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_bytes(path: str, data: bytes) -> None:
+    """Write already-encoded output straight to the file descriptor."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def file_digest(path: str) -> str:
+    """BLAKE2b hex digest of a file's contents."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "blake2b").hexdigest()
+
+
+def _stamp_path(output_file: str) -> Path:
+    return Path(f"{output_file}.stamp")
+
+
+def _stamp(input_file: str, code_file: str) -> str:
+    return f"{file_digest(input_file)}:{file_digest(code_file)}"
+
+
+def load_if_unchanged(input_file: str, output_file: str, code_file: str) -> Dict[str, Any] | None:
+    """
+    Return the saved output if it was produced from this exact input and code.
+
+    The output's .stamp file holds the digests of the input it was built from
+    and of the stage's source file (code_file, normally the stage module's
+    __file__), so editing the stage also forces a re-run.
+    """
+    stamp = _stamp_path(output_file)
+    output = Path(output_file)
+
+    if not stamp.exists() or not output.exists():
+        return None
+    if output.stat().st_mtime < Path(input_file).stat().st_mtime:
+        return None
+    if stamp.read_text(encoding="utf-8").strip() != _stamp(input_file, code_file):
+        return None
+
+    return load_json(output_file)
+
+
+def write_stamp(input_file: str, output_file: str, code_file: str) -> None:
+    """Record which input and stage code the saved output was produced from."""
+    _stamp_path(output_file).write_text(_stamp(input_file, code_file), encoding="utf-8")
@@ -2,9 +2,23 @@
 
 import json
 import re
-from collections import defaultdict
+import sys
 from typing import Dict, Any, List
 
+try:
+    from .output_cache import load_json, load_if_unchanged, write_bytes, write_stamp
+except ImportError:
+    # Run as a script (python post_processor.py), not as part of the parsers package
+    from output_cache import load_json, load_if_unchanged, write_bytes, write_stamp
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Precompiled patterns (applied to every section, subsection and paragraph)
+_RE_WHITESPACE = re.compile(r'\s+')
+_RE_MERGED_TITLE = re.compile(r'^(.+?)\.\s+(\d+)\s+([A-Z].*)$')
 
 def add_metadata(document: Dict[str, Any]) -> None:
     """Add missing metadata fields like citation and source URL."""
@@ -17,12 +31,99 @@ def add_metadata(document: Dict[str, Any]) -> None:
     # Add source URL
     document["source_url"] = "https://www.ontario.ca/laws/statute/06r17"
 
-    # Add processing metadata
-    document["metadata"] = {
+    # Add processing metadata (keeping counts recorded by the parser)
+    document.setdefault("metadata", {}).update({
         "processed_date": None,  # Will be set when ingested
         "version": "1.0",
         "parser": "unstructured-docx"
-    }
+    })
+
+
+def _renumber_duplicate_section(section: Dict[str, Any], section_counter: Dict[str, int]) -> None:
+    """Give the second+ occurrence of a section number a ".1", ".2" suffix."""
+    section_num = section.get("section_number", "")
+
+    # Check if this is a decimal number already (e.g., "5.1")
+    if "." in section_num:
+        return
+
+    # Count occurrences
+    occurrence = section_counter.get(section_num, 0) + 1
+    section_counter[section_num] = occurrence
+
+    # If this is the second+ occurrence, append .1, .2, etc.
+    if occurrence > 1:
+        section["section_number"] = f"{section_num}.{occurrence - 1}"
+
+
+def _split_merged_section_title(section: Dict[str, Any]) -> None:
+    """Trim a section title that has the next section's heading merged in."""
+    title = section.get("section_title", "")
+
+    # Look for pattern: "...text. NUMBER CAPITAL_LETTER"
+    # This suggests merged content
+    match = _RE_MERGED_TITLE.search(title)
+
+    if match:
+        # Keep only the first part as the title
+        section["section_title"] = match.group(1).strip()
+
+        # Store the detected merge for manual review
+        if "merge_detected" not in section:
+            section["merge_detected"] = {
+                "original_title": title,
+                "split_at": f"{match.group(2)} {match.group(3)}"
+            }
+
+
+def _clean_section_whitespace(section: Dict[str, Any]) -> None:
+    """Collapse whitespace in a section's text, title, subsections and paragraphs."""
+    collapse_whitespace = _RE_WHITESPACE.sub
+
+    # Clean section text
+    section_text = section.get("section_text")
+    if section_text:
+        section["section_text"] = collapse_whitespace(' ', section_text).strip()
+
+    # Clean section title
+    section_title = section.get("section_title")
+    if section_title:
+        section["section_title"] = collapse_whitespace(' ', section_title).strip()
+
+    for subsection in section.get("subsections", []):
+        # Clean subsection text
+        subsection_text = subsection.get("subsection_text")
+        if subsection_text:
+            subsection["subsection_text"] = collapse_whitespace(' ', subsection_text).strip()
+
+        for paragraph in subsection.get("paragraphs", []):
+            # Clean paragraph text
+            paragraph_text = paragraph.get("text")
+            if paragraph_text:
+                paragraph["text"] = collapse_whitespace(' ', paragraph_text).strip()
+
+
+def _clean_part_whitespace(part: Dict[str, Any]) -> None:
+    """Collapse whitespace in a part description."""
+    description = part.get("description")
+    if description is not None:
+        part["description"] = _RE_WHITESPACE.sub(' ', description).strip()
+
+
+def _remove_empty_section_fields(section: Dict[str, Any]) -> None:
+    """Drop empty text fields and paragraph lists from a section."""
+    # Remove empty section_text
+    if not section.get("section_text"):
+        section.pop("section_text", None)
+
+    for subsection in section.get("subsections", []):
+        # Remove empty subsection_text
+        if not subsection.get("subsection_text"):
+            subsection.pop("subsection_text", None)
+
+        # Remove empty paragraphs array
+        if not subsection.get("paragraphs"):
+            subsection.pop("paragraphs", None)
 
 
 def fix_duplicate_section_numbers(parts: List[Dict[str, Any]]) -> None:
@@ -32,27 +133,11 @@ def fix_duplicate_section_numbers(parts: List[Dict[str, Any]]) -> None:
     """
 
     for part in parts:
-        sections = part.get("sections", [])
-        if not sections:
-            continue
-
         # Track section number occurrences
-        section_counter = defaultdict(int)
-
-        for section in sections:
-            section_num = section.get("section_number", "")
+        section_counter = {}
 
-            # Check if this is a decimal number already (e.g., "5.1")
-            if "." in section_num:
-                continue
-
-            # Count occurrences
-            section_counter[section_num] += 1
-            occurrence = section_counter[section_num]
-
-            # If this is the second+ occurrence, append .1, .2, etc.
-            if occurrence > 1:
-                section["section_number"] = f"{section_num}.{occurrence - 1}"
+        for section in part.get("sections", []):
+            _renumber_duplicate_section(section, section_counter)
 
 
 def split_merged_section_titles(parts: List[Dict[str, Any]]) -> None:
@@ -62,53 +147,18 @@ def split_merged_section_titles(parts: List[Dict[str, Any]]) -> None:
     """
 
     for part in parts:
-        sections = part.get("sections", [])
-
-        for section in sections:
-            title = section.get("section_title", "")
-
-            # Look for pattern: "...text. NUMBER CAPITAL_LETTER"
-            # This suggests merged content
-            match = re.search(r'^(.+?)\.\s+(\d+)\s+([A-Z].*)$', title)
-
-            if match:
-                # Keep only the first part as the title
-                section["section_title"] = match.group(1).strip()
-
-                # Store the detected merge for manual review
-                if "merge_detected" not in section:
-                    section["merge_detected"] = {
-                        "original_title": title,
-                        "split_at": f"{match.group(2)} {match.group(3)}"
-                    }
+        for section in part.get("sections", []):
+            _split_merged_section_title(section)
 
 
 def clean_section_text_whitespace(parts: List[Dict[str, Any]]) -> None:
     """Clean up excessive whitespace in all text fields."""
 
     for part in parts:
-        # Clean part description if exists
-        if "description" in part:
-            part["description"] = re.sub(r'\s+', ' ', part["description"]).strip()
+        _clean_part_whitespace(part)
 
         for section in part.get("sections", []):
-            # Clean section text
-            if section.get("section_text"):
-                section["section_text"] = re.sub(r'\s+', ' ', section["section_text"]).strip()
-
-            # Clean section title
-            if section.get("section_title"):
-                section["section_title"] = re.sub(r'\s+', ' ', section["section_title"]).strip()
-
-            for subsection in section.get("subsections", []):
-                # Clean subsection text
-                if subsection.get("subsection_text"):
-                    subsection["subsection_text"] = re.sub(r'\s+', ' ', subsection["subsection_text"]).strip()
-
-                for paragraph in subsection.get("paragraphs", []):
-                    # Clean paragraph text
-                    if paragraph.get("text"):
-                        paragraph["text"] = re.sub(r'\s+', ' ', paragraph["text"]).strip()
+            _clean_section_whitespace(section)
 
 
 def remove_empty_fields(parts: List[Dict[str, Any]]) -> None:
@@ -116,18 +166,28 @@ def remove_empty_fields(parts: List[Dict[str, Any]]) -> None:
 
     for part in parts:
         for section in part.get("sections", []):
-            # Remove empty section_text
-            if not section.get("section_text"):
-                section.pop("section_text", None)
+            _remove_empty_section_fields(section)
+
+
+def clean_parts(parts: List[Dict[str, Any]]) -> None:
+    """
+    Fix numbering, merged titles, whitespace and empty fields in one walk.
 
-            for subsection in section.get("subsections", []):
-                # Remove empty subsection_text
-                if not subsection.get("subsection_text"):
-                    subsection.pop("subsection_text", None)
+    Equivalent to running fix_duplicate_section_numbers,
+    split_merged_section_titles, clean_section_text_whitespace and
+    remove_empty_fields in that order, but visits each section once.
+    """
+
+    for part in parts:
+        _clean_part_whitespace(part)
 
-                # Remove empty paragraphs array
-                if not subsection.get("paragraphs"):
-                    subsection.pop("paragraphs", None)
+        section_counter = {}
+
+        for section in part.get("sections", []):
+            _renumber_duplicate_section(section, section_counter)
+            _split_merged_section_title(section)
+            _clean_section_whitespace(section)
+            _remove_empty_section_fields(section)
 
 
 def validate_structure(document: Dict[str, Any]) -> List[str]:
@@ -167,12 +227,33 @@ def validate_structure(document: Dict[str, Any]) -> List[str]:
     return issues
 
 
-def post_process_document(input_file: str, output_file: str) -> Dict[str, Any]:
-    """Main post-processing function."""
+def post_process_document(
+    document: Dict[str, Any] | str,
+    output_file: str | None = None,
+) -> Dict[str, Any]:
+    """Main post-processing function.
+
+    A document dict is cleaned in place and returned, so the parsed tree is
+    never copied between stages.
+
+    Args:
+        document: Parsed document dict, or path to its JSON file (if that
+            file is unchanged since output_file was written, the saved
+            output is returned instead)
+        output_file: Where to save the cleaned document (skipped if None)
+    """
+
+    input_file = None
+    if not isinstance(document, dict):
+        input_file = document
+        if output_file:
+            saved = load_if_unchanged(input_file, output_file, __file__)
+            if saved is not None:
+                print(f"✓ {input_file} unchanged since {output_file} was written, skipping")
+                return saved
 
-    print(f"Loading {input_file}...")
-    with open(input_file, "r", encoding="utf-8") as f:
-        document = json.load(f)
+        print(f"Loading {input_file}...")
+        document = load_json(input_file)
 
     print("Running post-processing steps...")
 
@@ -180,21 +261,13 @@ def post_process_document(input_file: str, output_file: str) -> Dict[str, Any]:
     print("  1. Adding citation and source URL...")
     add_metadata(document)
 
-    # Step 2: Fix duplicate section numbers
+    # Steps 2-5: Fix duplicate section numbers, split merged section
+    # titles, clean whitespace and remove empty fields (single tree walk)
     print("  2. Fixing duplicate section numbers...")
-    fix_duplicate_section_numbers(document["parts"])
-
-    # Step 3: Split merged section titles
     print("  3. Splitting merged section titles...")
-    split_merged_section_titles(document["parts"])
-
-    # Step 4: Clean whitespace
     print("  4. Cleaning whitespace...")
-    clean_section_text_whitespace(document["parts"])
-
-    # Step 5: Remove empty fields
     print("  5. Removing empty fields...")
-    remove_empty_fields(document["parts"])
+    clean_parts(document["parts"])
 
     # Step 6: Validate
     print("  6. Validating structure...")
@@ -208,51 +281,63 @@ def post_process_document(input_file: str, output_file: str) -> Dict[str, Any]:
         print("  ✓ Structure is valid")
 
     # Save cleaned document
-    print(f"\nSaving to {output_file}...")
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(document, f, indent=2, ensure_ascii=False)
-
-    # Print statistics
-    print("\n📊 Document Statistics:")
-    print(f"  - Act: {document['act_name']}")
-    print(f"  - Citation: {document['citation']}")
-    print(f"  - Source: {document['source_url']}")
-    print(f"  - Parts: {len(document['parts'])}")
-
-    total_sections = sum(len(part['sections']) for part in document['parts'])
-    total_subsections = sum(
-        len(section.get('subsections', []))
-        for part in document['parts']
-        for section in part['sections']
-    )
-
-    # Count sections with amendment info
-    sections_with_amendments = sum(
-        1 for part in document['parts']
-        for section in part['sections']
-        if 'amendment_info' in section
-    )
-
-    # Count subsections with amendment info
-    subsections_with_amendments = sum(
-        1 for part in document['parts']
-        for section in part['sections']
-        for subsection in section.get('subsections', [])
-        if 'amendment_info' in subsection
-    )
-
-    print(f"  - Total Sections: {total_sections}")
-    print(f"  - Total Subsections: {total_subsections}")
-    print(f"  - Sections with amendment info: {sections_with_amendments}")
-    print(f"  - Subsections with amendment info: {subsections_with_amendments}")
-    print(f"  - Definitions: {len(document.get('definitions', []))}")
-    print(f"  - Schedules: {len(document.get('schedules', []))}")
-    print(f"  - Standalone Amendments: {len(document.get('amendments', []))}")
+    if output_file:
+        print(f"\nSaving to {output_file}...")
+        if orjson is not None:
+            write_bytes(output_file, orjson.dumps(document, option=orjson.OPT_INDENT_2))
+        else:
+            write_bytes(output_file, json.dumps(document, indent=2, ensure_ascii=False).encode("utf-8"))
+
+        if input_file:
+            write_stamp(input_file, output_file, __file__)
+
+    # Print statistics (collected and written to stdout in one call)
+    summary_lines = [
+        "",
+        "📊 Document Statistics:",
+        f"  - Act: {document['act_name']}",
+        f"  - Citation: {document['citation']}",
+        f"  - Source: {document['source_url']}",
+        f"  - Parts: {len(document['parts'])}",
+    ]
+
+    # Count sections, subsections and those with amendment info in one walk
+    total_sections = 0
+    total_subsections = 0
+    sections_with_amendments = 0
+    subsections_with_amendments = 0
+
+    for part in document['parts']:
+        sections = part['sections']
+        total_sections += len(sections)
+
+        for section in sections:
+            if 'amendment_info' in section:
+                sections_with_amendments += 1
+
+            subsections = section.get('subsections', [])
+            total_subsections += len(subsections)
+
+            for subsection in subsections:
+                if 'amendment_info' in subsection:
+                    subsections_with_amendments += 1
+
+    summary_lines += [
+        f"  - Total Sections: {total_sections}",
+        f"  - Total Subsections: {total_subsections}",
+        f"  - Sections with amendment info: {sections_with_amendments}",
+        f"  - Subsections with amendment info: {subsections_with_amendments}",
+        f"  - Definitions: {len(document.get('definitions', []))}",
+        f"  - Schedules: {len(document.get('schedules', []))}",
+        f"  - Standalone Amendments: {len(document.get('amendments', []))}",
+    ]
 
     # Show part breakdown
-    print("\n📚 Parts Breakdown:")
+    summary_lines += ["", "📚 Parts Breakdown:"]
     for part in document['parts']:
-        print(f"  • {part['part_number']}: {part['part_title']} ({len(part['sections'])} sections)")
+        summary_lines.append(f"  • {part['part_number']}: {part['part_title']} ({len(part['sections'])} sections)")
+
+    sys.stdout.write("\n".join(summary_lines) + "\n")
 
     return document
 
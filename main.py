@@ -1,5 +1,7 @@
 """Main application entry point integrating FastAPI and Chainlit."""
 import os
+import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
@@ -9,21 +11,46 @@ import google.generativeai as genai
 # Import config early to ensure .env is loaded
 import config
 
+config.configure()
+
 from src.web.api_routes import router as api_router
 
 # Get configuration from environment variables
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", "8000"))
-CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*").split(",") if os.getenv("CORS_ORIGINS") else ["*"]
+WORKERS = int(os.getenv("WORKERS", "1"))
+WARM_UP = os.getenv("WARM_UP", "true").lower() == "true"
+_cors_origins = os.getenv("CORS_ORIGINS")
+CORS_ORIGINS = tuple(origin.strip() for origin in _cors_origins.split(",")) if _cors_origins else ("*",)
 
 # Configure Google Generative AI API key
 genai.configure(api_key=config.GEMINI_API_KEY)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load models, open connections and compile graphs before serving."""
+    if WARM_UP:
+        from src.langchain.rag_graph import warm_up_rag_graph
+        from src.langchain.contract_graph import get_contract_analysis_graph
+
+        start = time.perf_counter()
+        try:
+            warm_up_rag_graph()
+            get_contract_analysis_graph()
+            print(f"🔥 Warm-up complete in {time.perf_counter() - start:.2f}s")
+        except Exception as e:
+            print(f"Warning: Warm-up failed: {e}")
+            print("The first query will pay the startup cost instead.")
+    yield
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="AI Agent for Tenancies",
     description="Backend API with integrated Chainlit chat interface",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -41,13 +68,20 @@ app.include_router(api_router, prefix="/api", tags=["api"])
 # Mount Chainlit app
 try:
     mount_chainlit(app=app, target="src/web/app.py", path="/chainlit")
-    print("Available Gemini models:")
-    # for m in genai.list_models():
-    #     print(f"Model: {m.name}")
 except Exception as e:
     print(f"Warning: Failed to mount Chainlit app: {e}")
     print("Chainlit interface may not be available.")
 
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host=HOST, port=PORT, reload=False)
\ No newline at end of file
+    # "auto" picks uvloop and httptools when installed (uvicorn[standard]),
+    # falling back to asyncio and h11
+    uvicorn.run(
+        "main:app",
+        host=HOST,
+        port=PORT,
+        reload=False,
+        loop=os.getenv("UVICORN_LOOP", "auto"),
+        http=os.getenv("UVICORN_HTTP", "auto"),
+        workers=WORKERS,
+    )
\ No newline at end of file
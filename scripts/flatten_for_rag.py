@@ -10,8 +10,13 @@ import json
 import sys
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add root directory to path for config
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import (
     JURISDICTION_ABBR,
     ACT_ABBR,
@@ -20,6 +25,7 @@ from config import (
     MIN_CHUNK_LENGTH,
     RAG_READY_JSON,
     OUTPUT_FINAL as INPUT_JSON,
+    configure,
 )
 
 
@@ -50,6 +56,7 @@ def flatten_to_rag_chunks(document):
     - If section has no subsections: section itself = 1 chunk
     """
     chunks = []
+    append = chunks.append
 
     act_name = document.get("act_name", "")
     jurisdiction = document.get("jurisdiction", "")
@@ -61,25 +68,33 @@ def flatten_to_rag_chunks(document):
         part_title = part.get("part_title", "")
 
         for section in part.get("sections", []):
-            section_id = section.get("section_id", "")
             section_number = section.get("section_number", "")
-            section_title = section.get("section_title", "")
-            section_text = section.get("section_text", "")
             section_amendment_info = section.get("amendment_info")
 
+            # Metadata shared by every chunk of this section (built once)
+            section_metadata = {
+                "act_name": act_name,
+                "jurisdiction": jurisdiction,
+                "citation": citation,
+                "part_number": part_number,
+                "part_title": part_title,
+                "section_id": section.get("section_id", ""),
+                "section_number": section_number,
+                "section_title": section.get("section_title", ""),
+            }
+
             subsections = section.get("subsections", [])
 
             if subsections:
                 # Create chunks from subsections
                 for subsection in subsections:
-                    subsection_number = subsection.get("subsection_number", "")
                     subsection_text = subsection.get("subsection_text", "")
-                    subsection_amendment_info = subsection.get("amendment_info")
 
                     # Skip empty subsections
                     if not subsection_text or len(subsection_text) < MIN_CHUNK_LENGTH:
                         continue
 
+                    subsection_number = subsection.get("subsection_number", "")
                     chunk_id = generate_chunk_id(
                         JURISDICTION_ABBR,
                         ACT_ABBR,
@@ -88,36 +103,24 @@ def flatten_to_rag_chunks(document):
                         subsection_number
                     )
 
-                    chunk = {
-                        "id": chunk_id,
-                        "text": subsection_text,
-                        "metadata": {
-                            "act_name": act_name,
-                            "jurisdiction": jurisdiction,
-                            "citation": citation,
-                            "part_number": part_number,
-                            "part_title": part_title,
-                            "section_id": section_id,
-                            "section_number": section_number,
-                            "section_title": section_title,
-                            "subsection_number": subsection_number,
-                            "source_url": source_url,
-                            "tokens": estimate_tokens(subsection_text),
-                            "chunk_type": "subsection"
-                        }
+                    metadata = {
+                        **section_metadata,
+                        "subsection_number": subsection_number,
+                        "source_url": source_url,
+                        "tokens": estimate_tokens(subsection_text),
+                        "chunk_type": "subsection"
                     }
 
-                    # Add amendment info if present
-                    if subsection_amendment_info:
-                        chunk["metadata"]["amendment_info"] = subsection_amendment_info
-                    elif section_amendment_info:
-                        # Fallback to section amendment info
-                        chunk["metadata"]["amendment_info"] = section_amendment_info
+                    # Add amendment info if present (fallback to section amendment info)
+                    amendment_info = subsection.get("amendment_info") or section_amendment_info
+                    if amendment_info:
+                        metadata["amendment_info"] = amendment_info
 
-                    chunks.append(chunk)
+                    append({"id": chunk_id, "text": subsection_text, "metadata": metadata})
 
             else:
                 # No subsections: use section itself as chunk
+                section_text = section.get("section_text", "")
                 if not section_text or len(section_text) < MIN_CHUNK_LENGTH:
                     continue
 
@@ -128,29 +131,18 @@ def flatten_to_rag_chunks(document):
                     section_number
                 )
 
-                chunk = {
-                    "id": chunk_id,
-                    "text": section_text,
-                    "metadata": {
-                        "act_name": act_name,
-                        "jurisdiction": jurisdiction,
-                        "citation": citation,
-                        "part_number": part_number,
-                        "part_title": part_title,
-                        "section_id": section_id,
-                        "section_number": section_number,
-                        "section_title": section_title,
-                        "source_url": source_url,
-                        "tokens": estimate_tokens(section_text),
-                        "chunk_type": "section"
-                    }
+                metadata = {
+                    **section_metadata,
+                    "source_url": source_url,
+                    "tokens": estimate_tokens(section_text),
+                    "chunk_type": "section"
                 }
 
                 # Add amendment info if present
                 if section_amendment_info:
-                    chunk["metadata"]["amendment_info"] = section_amendment_info
+                    metadata["amendment_info"] = section_amendment_info
 
-                chunks.append(chunk)
+                append({"id": chunk_id, "text": section_text, "metadata": metadata})
 
     return chunks
 
@@ -158,6 +150,8 @@ def flatten_to_rag_chunks(document):
 def main():
     """Main execution function."""
 
+    configure()
+
     print("=" * 70)
     print("📋 FLATTEN JSON FOR RAG")
     print("=" * 70)
@@ -175,8 +169,12 @@ def main():
 
     # Load parsed document
     print("🔧 Loading parsed document...")
-    with open(INPUT_JSON, "r", encoding="utf-8") as f:
-        document = json.load(f)
+    if orjson is not None:
+        with open(INPUT_JSON, "rb") as f:
+            document = orjson.loads(f.read())
+    else:
+        with open(INPUT_JSON, "r", encoding="utf-8") as f:
+            document = json.load(f)
 
     # Flatten to RAG chunks
     print("🔧 Flattening to RAG chunks...")
@@ -220,8 +218,13 @@ def main():
         "chunks": chunks
     }
 
-    with open(RAG_READY_JSON, "w", encoding="utf-8") as f:
-        json.dump(rag_data, f, indent=2, ensure_ascii=False)
+    # orjson's indented output is byte-identical to json.dump(indent=2, ensure_ascii=False)
+    if orjson is not None:
+        with open(RAG_READY_JSON, "wb") as f:
+            f.write(orjson.dumps(rag_data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(RAG_READY_JSON, "w", encoding="utf-8") as f:
+            json.dump(rag_data, f, indent=2, ensure_ascii=False)
 
     print(f"✓ RAG-ready file created: {RAG_READY_JSON}")
     print(f"  Size: {RAG_READY_JSON.stat().st_size / 1024:.1f} KB")
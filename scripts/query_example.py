@@ -1,63 +1,106 @@
 """Query the RAG system."""
 
+import functools
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import List
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import (
-    LOCAL_MODEL_NAME,
-    LOCAL_MODEL_DEVICE,
     NORMALIZE_EMBEDDINGS,
     PINECONE_API_KEY,
     PINECONE_INDEX_NAME,
+    ENABLE_SEMANTIC_CACHE,
+    SEMANTIC_CACHE_TTL,
 )
+from src.core.embeddings import get_sentence_transformer
+from src.core.semantic_cache import SemanticCache
 
+# Questions of one run are few, so a small cache (about 256KB of embeddings)
+# is enough; the config default preallocates room for 10000
+RESULTS_CACHE_SIZE = 64
 
-def query_rag(question: str, top_k: int = 5):
-    """Query RAG and print results."""
 
-    print("=" * 70)
-    print("🔍 RAG QUERY")
-    print("=" * 70)
-    print(f"\nQuestion: {question}\n")
+@functools.lru_cache(maxsize=1)
+def _get_index():
+    """Connect to the Pinecone index once per process."""
+    from pinecone import Pinecone
+    pc = Pinecone(api_key=PINECONE_API_KEY)
+    return pc.Index(PINECONE_INDEX_NAME)
 
-    # Load model
-    print(f"🔧 Loading {LOCAL_MODEL_NAME}...")
-    from sentence_transformers import SentenceTransformer
-    model = SentenceTransformer(LOCAL_MODEL_NAME, device=LOCAL_MODEL_DEVICE)
 
-    # Generate query embedding
-    query_embedding = model.encode(
-        question,
-        normalize_embeddings=NORMALIZE_EMBEDDINGS
-    ).tolist()
+@functools.lru_cache(maxsize=8)
+def _get_results_cache(top_k: int) -> SemanticCache:
+    """Get the semantic cache of search results for one top_k.
 
-    # Connect to Pinecone
-    from pinecone import Pinecone
-    pc = Pinecone(api_key=PINECONE_API_KEY)
-    index = pc.Index(PINECONE_INDEX_NAME)
-
-    # Search
-    print("🔧 Searching...")
-    results = index.query(
-        vector=query_embedding,
-        top_k=top_k,
-        include_metadata=True,
-        filter={"jurisdiction": "Ontario"}
-    )
-
-    # Display results
-    print(f"\n📊 Found {len(results.matches)} results:\n")
-    print("=" * 70)
-
-    for i, match in enumerate(results.matches, 1):
-        m = match.metadata
-        print(f"\n🔹 Result {i} (Score: {match.score:.4f})")
-        print(f"   Section: {m.get('section_number')} - {m.get('section_title', '')[:50]}")
-        if m.get('subsection_number'):
-            print(f"   Subsection: {m['subsection_number']}")
-        print(f"\n   {m.get('text', '')[:250]}...")
-        print("-" * 70)
+    Results depend on top_k and the filter as well as the question, so each
+    top_k (the filter is fixed here) gets its own cache.
+    """
+    return SemanticCache(max_entries=RESULTS_CACHE_SIZE, ttl=SEMANTIC_CACHE_TTL)
+
+
+def query_rag(question: str, top_k: int = 5):
+    """Query RAG and print results."""
+    query_rag_many([question], top_k)
+
+
+def query_rag_many(questions: List[str], top_k: int = 5):
+    """Query RAG for several questions and print results.
+
+    All questions are embedded in a single forward pass, while the Pinecone
+    connection is set up in a background thread.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Connect to Pinecone
+        index_future = executor.submit(_get_index)
+
+        # Generate query embeddings
+        query_embeddings = get_sentence_transformer().encode(
+            questions,
+            normalize_embeddings=NORMALIZE_EMBEDDINGS,
+            batch_size=len(questions)
+        )
+
+        index = index_future.result()
+
+    cache = _get_results_cache(top_k) if ENABLE_SEMANTIC_CACHE else None
+
+    for question, query_embedding in zip(questions, query_embeddings):
+        print("=" * 70)
+        print("🔍 RAG QUERY")
+        print("=" * 70)
+        print(f"\nQuestion: {question}\n")
+
+        # Reuse results of a recent near-identical question
+        results = cache.lookup(query_embedding) if cache is not None else None
+
+        if results is not None:
+            print("⚡ Served from semantic cache")
+        else:
+            # Search
+            print("🔧 Searching...")
+            results = index.query(
+                vector=query_embedding.tolist(),
+                top_k=top_k,
+                include_metadata=True,
+                filter={"jurisdiction": "Ontario"}
+            )
+            if cache is not None:
+                cache.add(query_embedding, results)
+
+        # Display results
+        print(f"\n📊 Found {len(results.matches)} results:\n")
+        print("=" * 70)
+
+        for i, match in enumerate(results.matches, 1):
+            m = match.metadata
+            print(f"\n🔹 Result {i} (Score: {match.score:.4f})")
+            print(f"   Section: {m.get('section_number')} - {m.get('section_title', '')[:50]}")
+            if m.get('subsection_number'):
+                print(f"   Subsection: {m['subsection_number']}")
+            print(f"\n   {m.get('text', '')[:250]}...")
+            print("-" * 70)
 
 
 def main():
@@ -74,16 +117,19 @@ def main():
     for i, q in enumerate(examples, 1):
         print(f"{i}. {q}")
 
-    print(f"\nEnter number (1-{len(examples)}) or type your question:")
+    print(f"\nEnter numbers (1-{len(examples)}) or questions, separated by ';':")
     user_input = input("> ").strip()
 
-    if user_input.isdigit() and 1 <= int(user_input) <= len(examples):
-        question = examples[int(user_input) - 1]
-    else:
-        question = user_input
+    questions = []
+    for entry in user_input.split(";"):
+        entry = entry.strip()
+        if entry.isdigit() and 1 <= int(entry) <= len(examples):
+            questions.append(examples[int(entry) - 1])
+        elif entry:
+            questions.append(entry)
 
-    if question:
-        query_rag(question)
+    if questions:
+        query_rag_many(questions)
 
 
 if __name__ == "__main__":
@@ -1,25 +1,161 @@
 """Generate embeddings with BAAI/bge-m3 and upsert to Pinecone."""
 
+import collections
+import contextlib
+import hashlib
+import itertools
 import json
 import sys
 import time
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import (
     PINECONE_API_KEY,
     PINECONE_INDEX_NAME,
-    OPENAI_API_KEY,
     RAG_READY_JSON,
     LOCAL_MODEL_NAME,
     LOCAL_MODEL_DEVICE,
     NORMALIZE_EMBEDDINGS,
     EMBEDDING_DIMENSION,
+    ENCODE_BATCH_SIZE,
+    ENCODE_BATCH_SIZE_CPU_MAX,
+    ENCODE_DEVICES,
+    ENCODE_BLOCK_SIZE,
+    EMBEDDING_CACHE_PATH,
     UPSERT_BATCH_SIZE,
+    UPSERT_POOL_THREADS,
+    UPSERT_MAX_RETRIES,
+    UPSERT_VALUE_DECIMALS,
 )
 
 
+def chunked(iterable: Iterable, size: int) -> Iterator[Tuple]:
+    """Yield successive tuples of up to size items."""
+    it = iter(iterable)
+    batch = tuple(itertools.islice(it, size))
+    while batch:
+        yield batch
+        batch = tuple(itertools.islice(it, size))
+
+
+# Chunk metadata not stored in Pinecone: amendment_info is nested (flattened
+# to amendment_citation below) and the token estimate is only used for
+# flatten_for_rag's chunk-size report
+EXCLUDED_METADATA_KEYS = frozenset({"amendment_info", "tokens"})
+
+
+def pinecone_metadata(chunk: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a chunk's text and metadata for Pinecone (no nested objects)."""
+    metadata = {
+        "text": chunk["text"],
+        **{k: v for k, v in chunk["metadata"].items() if k not in EXCLUDED_METADATA_KEYS}
+    }
+
+    # Convert amendment_info to string if present
+    if "amendment_info" in chunk["metadata"]:
+        metadata["amendment_citation"] = chunk["metadata"]["amendment_info"].get("citation", "")
+
+    return metadata
+
+
+def encode_texts(model, texts: List[str], batch_size: int, pool=None):
+    """Encode texts with BGE-M3, rounded for upload.
+
+    encode sorts texts by length internally, so each batch pads to
+    similar-length chunks. Values are rounded to UPSERT_VALUE_DECIMALS in
+    float64, which only matters for the REST client: it sends JSON, where
+    float32 rows serialize as ~17-digit numbers and rounded ones as ~8,
+    roughly halving the payload (an error of at most 5e-7 per unit-vector
+    component). The gRPC client sends protobuf float32 either way.
+    """
+    if pool is not None:
+        embeddings = model.encode_multi_process(
+            texts,
+            pool,
+            batch_size=batch_size,
+            normalize_embeddings=NORMALIZE_EMBEDDINGS,
+        )
+    else:
+        embeddings = model.encode(
+            texts,
+            normalize_embeddings=NORMALIZE_EMBEDDINGS,
+            show_progress_bar=False,
+            batch_size=batch_size
+        )
+
+    return embeddings.astype("float64").round(UPSERT_VALUE_DECIMALS)
+
+
+def text_digest(text: str) -> str:
+    """Content hash used as a chunk's embedding cache key."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def load_embedding_cache(path: Path) -> Dict[str, np.ndarray]:
+    """Load cached embeddings by text digest (empty if missing or from another model)."""
+    if not path.exists():
+        return {}
+
+    with np.load(path) as data:
+        if str(data["model"]) != LOCAL_MODEL_NAME:
+            return {}
+        embeddings = data["embeddings"].astype("float64").round(UPSERT_VALUE_DECIMALS)
+        return dict(zip(data["digests"].tolist(), embeddings))
+
+
+def save_embedding_cache(path: Path, cache: Dict[str, np.ndarray]) -> None:
+    """Save embeddings by text digest, compressed.
+
+    Stored as float32, which keeps UPSERT_VALUE_DECIMALS digits; cached vectors
+    are uploaded as-is, so they are not quantized further.
+    """
+    if not cache:
+        return
+
+    np.savez_compressed(
+        path,
+        model=np.array(LOCAL_MODEL_NAME),
+        digests=np.array(list(cache.keys())),
+        embeddings=np.stack(list(cache.values())).astype(np.float32),
+    )
+
+
+def wait_for_upsert(index, vectors: Tuple[Dict[str, Any], ...], async_result) -> None:
+    """Wait for an async upsert, re-sending the batch if it failed.
+
+    async_result is a concurrent.futures Future from the gRPC client or an
+    ApplyResult from the REST client.
+    """
+    try:
+        if hasattr(async_result, "result"):
+            async_result.result()
+        else:
+            async_result.get()
+        return
+    except Exception as err:
+        error = err
+
+    for attempt in range(1, UPSERT_MAX_RETRIES + 1):
+        print(f"  ⚠️ Batch failed ({error}), retry {attempt}/{UPSERT_MAX_RETRIES}")
+        time.sleep(2 ** attempt)
+        try:
+            index.upsert(vectors=list(vectors))
+            return
+        except Exception as err:
+            error = err
+
+    raise error
+
+
 def main():
     print("=" * 70)
     print("🚀 UPSERT TO PINECONE")
@@ -39,39 +175,62 @@ def main():
 
     print(f"\n📄 Input: {RAG_READY_JSON}")
     print(f"🔹 Model: {LOCAL_MODEL_NAME}")
-    print(f"🔹 Device: {LOCAL_MODEL_DEVICE}")
+    print(f"🔹 Device: {LOCAL_MODEL_DEVICE or 'auto'}")
     print(f"🔹 Index: {PINECONE_INDEX_NAME}\n")
 
     # Load chunks
     print("🔧 Loading chunks...")
-    with open(RAG_READY_JSON, "r", encoding="utf-8") as f:
-        rag_data = json.load(f)
+    if orjson is not None:
+        with open(RAG_READY_JSON, "rb") as f:
+            rag_data = orjson.loads(f.read())
+    else:
+        with open(RAG_READY_JSON, "r", encoding="utf-8") as f:
+            rag_data = json.load(f)
     chunks = rag_data["chunks"]
     print(f"✓ Loaded {len(chunks)} chunks")
 
-    # Load BGE-M3 model
-    print(f"\n🔧 Loading {LOCAL_MODEL_NAME}...")
-    print("  (First run downloads ~2GB model)")
+    # Split chunks into the columns the pipeline needs, with Pinecone-ready
+    # metadata built once up front
+    ids = [chunk["id"] for chunk in chunks]
+    texts = [chunk["text"] for chunk in chunks]
+    metadatas = [pinecone_metadata(chunk) for chunk in chunks]
+    digests = [text_digest(text) for text in texts]
+    del rag_data, chunks
+
+    # Reuse embeddings of chunks whose text is unchanged since the last run
+    cache = load_embedding_cache(EMBEDDING_CACHE_PATH)
+    unique_digests = set(digests)
+    to_encode = len(unique_digests - cache.keys())
+    print(f"✓ {len(unique_digests) - to_encode} embeddings cached, {to_encode} to encode")
 
-    from sentence_transformers import SentenceTransformer
-    model = SentenceTransformer(LOCAL_MODEL_NAME, device=LOCAL_MODEL_DEVICE)
-    print(f"✓ Model loaded")
+    model = None
+    batch_size = ENCODE_BATCH_SIZE
+    if to_encode:
+        # Load BGE-M3 model
+        print(f"\n🔧 Loading {LOCAL_MODEL_NAME}...")
+        print("  (First run downloads ~2GB model)")
 
-    # Generate embeddings
-    print(f"\n🔧 Generating {len(chunks)} embeddings...")
-    texts = [chunk["text"] for chunk in chunks]
-    embeddings = model.encode(
-        texts,
-        normalize_embeddings=NORMALIZE_EMBEDDINGS,
-        show_progress_bar=True,
-        batch_size=32
-    )
-    embeddings = embeddings.tolist()
-    print(f"✓ Generated embeddings (dimension: {len(embeddings[0])})")
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(LOCAL_MODEL_NAME, device=LOCAL_MODEL_DEVICE)
+
+        # Half precision on GPU (normalization still yields unit vectors); the
+        # same rule as get_sentence_transformer in src/core/embeddings.py, so
+        # chunks and queries are embedded at the same precision
+        if model.device.type != "cpu":
+            model.half()
+        print(f"✓ Model loaded ({model.device.type}, {'fp16' if model.device.type != 'cpu' else 'fp32'})")
+
+        if model.device.type == "cpu":
+            batch_size = min(batch_size, ENCODE_BATCH_SIZE_CPU_MAX)
 
     # Connect to Pinecone
     print(f"\n🔧 Connecting to Pinecone...")
-    from pinecone import Pinecone, ServerlessSpec
+    from pinecone import ServerlessSpec
+    try:
+        # HTTP/2 + protobuf client, faster for many upsert calls (pinecone[grpc])
+        from pinecone.grpc import PineconeGRPC as Pinecone
+    except ImportError:
+        from pinecone import Pinecone
 
     pc = Pinecone(api_key=PINECONE_API_KEY)
 
@@ -88,37 +247,72 @@ def main():
     else:
         print(f"  Using existing index")
 
-    index = pc.Index(PINECONE_INDEX_NAME)
-
-    # Upsert vectors
-    print(f"\n🔧 Upserting {len(chunks)} vectors...")
-    for i in range(0, len(chunks), UPSERT_BATCH_SIZE):
-        batch_chunks = chunks[i:i + UPSERT_BATCH_SIZE]
-        batch_embeddings = embeddings[i:i + UPSERT_BATCH_SIZE]
-
-        vectors = []
-        for chunk, embedding in zip(batch_chunks, batch_embeddings):
-            # Flatten metadata for Pinecone (no nested objects)
-            metadata = {
-                "text": chunk["text"],
-                **{k: v for k, v in chunk["metadata"].items() if k != "amendment_info"}
-            }
-
-            # Convert amendment_info to string if present
-            if "amendment_info" in chunk["metadata"]:
-                metadata["amendment_citation"] = chunk["metadata"]["amendment_info"].get("citation", "")
-
-            vectors.append({
-                "id": chunk["id"],
-                "values": embedding,
-                "metadata": metadata
-            })
-
-        index.upsert(vectors=vectors)
-        print(f"  Batch {i//UPSERT_BATCH_SIZE + 1} done")
-
-    # Stats
-    stats = index.describe_index_stats()
+    # Encode and upsert as a pipeline: texts are encoded a block at a time and
+    # each block's batches are upserted in the background (over the index's
+    # thread pool) while the next block encodes. At most UPSERT_POOL_THREADS
+    # batches are in flight, so only those (and the current block) hold
+    # Python-float vectors
+    print(f"\n🔧 Embedding and upserting {len(ids)} vectors (batch size: {batch_size})...")
+
+    pool = None
+    if model is not None and ENCODE_DEVICES:
+        # Data-parallel encoding: one worker process per device
+        print(f"  Sharding across {len(ENCODE_DEVICES)} workers: {', '.join(ENCODE_DEVICES)}")
+        pool = model.start_multi_process_pool(target_devices=ENCODE_DEVICES)
+
+    try:
+        with contextlib.closing(pc.Index(PINECONE_INDEX_NAME, pool_threads=UPSERT_POOL_THREADS)) as index:
+            pending = collections.deque()
+            batches_done = 0
+
+            for start in range(0, len(texts), ENCODE_BLOCK_SIZE):
+                block = slice(start, start + ENCODE_BLOCK_SIZE)
+                block_digests = digests[block]
+
+                # Encode only the texts not in the cache
+                missing = {
+                    digest: text
+                    for digest, text in zip(block_digests, texts[block])
+                    if digest not in cache
+                }
+                if missing:
+                    new_embeddings = encode_texts(model, list(missing.values()), batch_size, pool)
+                    cache.update(zip(missing.keys(), new_embeddings))
+                embeddings = np.stack([cache[digest] for digest in block_digests])
+
+                # One tolist() per block converts all rows in a single C call
+                vectors = (
+                    {"id": chunk_id, "values": values, "metadata": metadata}
+                    for chunk_id, values, metadata in zip(ids[block], embeddings.tolist(), metadatas[block])
+                )
+                for batch in chunked(vectors, UPSERT_BATCH_SIZE):
+                    if len(pending) >= UPSERT_POOL_THREADS:
+                        wait_for_upsert(index, *pending.popleft())
+                        batches_done += 1
+                    pending.append((batch, index.upsert(vectors=list(batch), async_req=True)))
+
+                print(f"  Encoded {min(start + ENCODE_BLOCK_SIZE, len(texts))}/{len(texts)}"
+                      f" (dimension: {embeddings.shape[1]}), {batches_done} batches upserted")
+
+            while pending:
+                wait_for_upsert(index, *pending.popleft())
+                batches_done += 1
+            print(f"✓ Upserted {batches_done} batches")
+
+            # Stats
+            stats = index.describe_index_stats()
+    finally:
+        if pool is not None:
+            model.stop_multi_process_pool(pool)
+
+        # Save what was encoded even if an upsert failed; entries for chunks
+        # no longer in the input are dropped
+        if to_encode:
+            save_embedding_cache(
+                EMBEDDING_CACHE_PATH,
+                {digest: cache[digest] for digest in digests if digest in cache},
+            )
+
     print(f"\n📊 Pinecone Stats:")
     print(f"  Vectors: {stats.total_vector_count}")
     print(f"  Dimension: {stats.dimension}")
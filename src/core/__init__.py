@@ -1,16 +1,22 @@
 """Core RAG functionality."""
 
-from .embeddings import BGEEmbeddings
+from .embeddings import BGEEmbeddings, get_sentence_transformer
 from .vectorstore import get_vectorstore
-from .retriever import get_retriever
+from .retriever import get_retriever, aembed_and_search_many
 from .qa import get_answer
 from .llm import get_llm
+from .semantic_cache import SemanticCache, get_semantic_cache, mentions_other_jurisdiction
 
 __all__ = [
     "BGEEmbeddings",
+    "get_sentence_transformer",
     "get_vectorstore",
     "get_retriever",
+    "aembed_and_search_many",
     "get_answer",
     "get_llm",
+    "SemanticCache",
+    "get_semantic_cache",
+    "mentions_other_jurisdiction",
 ]
 
@@ -1,6 +1,10 @@
 """Custom BGE-M3 embeddings wrapper for LangChain."""
 
-from typing import List
+import collections
+import functools
+import threading
+from typing import List, Optional
+import numpy as np
 from langchain_core.embeddings import Embeddings
 from sentence_transformers import SentenceTransformer
 
@@ -13,9 +17,78 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import (
     LOCAL_MODEL_NAME,
     LOCAL_MODEL_DEVICE,
+    LOCAL_MODEL_QUANTIZED,
+    LOCAL_MODEL_CACHE_DIR,
     NORMALIZE_EMBEDDINGS,
+    EMBEDDING_CACHE_SIZE,
 )
 
+# File written by sentence_transformers' dynamic int8 ONNX export
+QUANTIZED_ONNX_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+
+def load_quantized_model(model_name: str) -> SentenceTransformer:
+    """Load an int8-quantized ONNX Runtime version of a model on CPU.
+
+    The quantized export is created under LOCAL_MODEL_CACHE_DIR on first use
+    and reused afterwards.
+
+    Args:
+        model_name: Hugging Face model name
+
+    Returns:
+        SentenceTransformer using the ONNX backend
+    """
+    save_dir = LOCAL_MODEL_CACHE_DIR / f"{model_name.replace('/', '--')}-int8"
+
+    if not (save_dir / QUANTIZED_ONNX_FILE).exists():
+        from sentence_transformers.backend import export_dynamic_quantized_onnx_model
+
+        print(f"🔧 Exporting int8 ONNX model to {save_dir} (first run only)...")
+        model = SentenceTransformer(model_name, device="cpu", backend="onnx")
+        model.save(str(save_dir))
+        export_dynamic_quantized_onnx_model(model, "avx512_vnni", str(save_dir))
+
+    return SentenceTransformer(
+        str(save_dir),
+        device="cpu",
+        backend="onnx",
+        model_kwargs={"file_name": QUANTIZED_ONNX_FILE},
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_sentence_transformer(model_name: str = None, device: str = None) -> SentenceTransformer:
+    """Load an embedding model once per process and share it.
+
+    Uses the int8 ONNX model when LOCAL_MODEL_QUANTIZED is set (falling back
+    to full precision if unavailable), and half precision on GPU.
+
+    Args:
+        model_name: Hugging Face model name (default: from config)
+        device: Device to use (default: from config, auto-detected if unset)
+
+    Returns:
+        Shared SentenceTransformer instance
+    """
+    model_name = model_name or LOCAL_MODEL_NAME
+
+    if LOCAL_MODEL_QUANTIZED:
+        print(f"🔧 Loading {model_name} (int8 ONNX) on cpu...")
+        try:
+            return load_quantized_model(model_name)
+        except ImportError as err:
+            print(f"⚠️ Quantized model unavailable ({err}). Falling back to full precision.")
+
+    print(f"🔧 Loading {model_name} on {device or LOCAL_MODEL_DEVICE or 'auto'}...")
+    # SentenceTransformer picks CUDA/MPS when available if device is None
+    model = SentenceTransformer(model_name, device=device or LOCAL_MODEL_DEVICE)
+
+    # Half precision on GPU
+    if model.device.type != "cpu":
+        model.half()
+    return model
+
 
 class BGEEmbeddings(Embeddings):
     """LangChain-compatible wrapper for BAAI/bge-m3 embeddings."""
@@ -28,17 +101,51 @@ class BGEEmbeddings(Embeddings):
     ):
         """Initialize BGE-M3 model.
 
+        The underlying model is shared by every instance with the same
+        model_name and device (see get_sentence_transformer). Embeddings of
+        the last EMBEDDING_CACHE_SIZE distinct texts are kept, so repeated
+        questions skip the model.
+
         Args:
             model_name: Model name (default: from config)
-            device: Device to use (default: from config)
+            device: Device to use (default: from config, auto-detected if unset)
             normalize: Whether to normalize embeddings (default: True)
         """
         self.model_name = model_name or LOCAL_MODEL_NAME
-        self.device = device or LOCAL_MODEL_DEVICE
         self.normalize = normalize
 
-        print(f"🔧 Loading {self.model_name} on {self.device}...")
-        self.model = SentenceTransformer(self.model_name, device=self.device)
+        self.model = get_sentence_transformer(self.model_name, device)
+        self.device = self.model.device.type
+
+        # Larger batches to keep a GPU busy
+        self.batch_size = 32 if self.device == "cpu" else 64
+
+        # float32 arrays (4KB per bge-m3 embedding, vs ~32KB as Python floats)
+        self._cache: "collections.OrderedDict[str, np.ndarray]" = collections.OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._pending_queries: dict = {}  # Query text -> Event set once it is cached
+
+    def _cache_get(self, text: str) -> Optional[List[float]]:
+        """Return the cached embedding of a text, marking it recently used."""
+        with self._cache_lock:
+            embedding = self._cache.get(text)
+            if embedding is None:
+                return None
+            self._cache.move_to_end(text)
+        return embedding.tolist()
+
+    def _cache_put(self, text: str, embedding: np.ndarray) -> None:
+        """Cache an embedding, evicting the least recently used beyond the limit."""
+        if EMBEDDING_CACHE_SIZE <= 0:
+            return
+
+        # Copy, so a row doesn't keep its whole batch array alive
+        embedding = np.array(embedding, dtype=np.float32)
+        with self._cache_lock:
+            self._cache[text] = embedding
+            self._cache.move_to_end(text)
+            while len(self._cache) > EMBEDDING_CACHE_SIZE:
+                self._cache.popitem(last=False)
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """Embed a list of documents.
@@ -49,14 +156,27 @@ class BGEEmbeddings(Embeddings):
         Returns:
             List of embeddings (each embedding is a list of floats)
         """
-        embeddings = self.model.encode(
-            texts,
-            normalize_embeddings=self.normalize,
-            show_progress_bar=False,
-            batch_size=32,
-            convert_to_numpy=True,
-        )
-        return embeddings.tolist()
+        cached = [self._cache_get(text) for text in texts]
+
+        # Encode each distinct uncached text once
+        missing = list(dict.fromkeys(text for text, embedding in zip(texts, cached) if embedding is None))
+        encoded = {}
+        if missing:
+            embeddings = self.model.encode(
+                missing,
+                normalize_embeddings=self.normalize,
+                show_progress_bar=False,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+            )
+            for text, embedding in zip(missing, embeddings):
+                self._cache_put(text, embedding)
+                encoded[text] = embedding.tolist()
+
+        return [
+            embedding if embedding is not None else encoded[text]
+            for text, embedding in zip(texts, cached)
+        ]
 
     def embed_query(self, text: str) -> List[float]:
         """Embed a single query text.
@@ -67,10 +187,36 @@ class BGEEmbeddings(Embeddings):
         Returns:
             Embedding as list of floats
         """
-        embedding = self.model.encode(
-            [text],
-            normalize_embeddings=self.normalize,
-            show_progress_bar=False,
-            convert_to_numpy=True,
-        )
-        return embedding[0].tolist()
+        cached = self._cache_get(text)
+        if cached is not None:
+            return cached
+
+        # Concurrent calls for the same text (e.g. the RAG graph's classify
+        # and retrieve nodes) wait for the first one instead of re-encoding
+        with self._cache_lock:
+            pending = self._pending_queries.get(text)
+            is_first = pending is None
+            if is_first:
+                pending = self._pending_queries[text] = threading.Event()
+
+        if not is_first:
+            pending.wait()
+            cached = self._cache_get(text)
+            if cached is not None:
+                return cached
+
+        try:
+            encoded = self.model.encode(
+                [text],
+                normalize_embeddings=self.normalize,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+            )[0]
+            self._cache_put(text, encoded)
+            embedding = encoded.tolist()
+        finally:
+            if is_first:
+                with self._cache_lock:
+                    del self._pending_queries[text]
+                pending.set()
+        return embedding
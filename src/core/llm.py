@@ -1,14 +1,56 @@
 """LLM factory for Gemini (Google Generative AI)."""
 
+import functools
+import json
 import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 # Add root directory to path for config import
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from langchain_core.language_models import BaseChatModel
-from config import GEMINI_API_KEY, LLM_MODEL_NAME, LLM_TEMPERATURE
+from config import (
+    GEMINI_API_KEY,
+    LLM_MODEL_NAME,
+    LLM_TEMPERATURE,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_MAX_BURST,
+)
+
+# Model list cache (listing models is a network round-trip on every get_llm)
+MODEL_LIST_CACHE = Path.home() / ".cache" / "ontario-tenancy" / "gemini_models.json"
+MODEL_LIST_TTL = 24 * 60 * 60  # seconds
+
+
+def get_available_models(api_key: str, ttl: int = MODEL_LIST_TTL) -> List[str]:
+    """
+    List Gemini models that support generateContent.
+
+    The list is cached on disk and only refetched from the API once it is
+    older than ttl seconds.
+    """
+    try:
+        if time.time() - MODEL_LIST_CACHE.stat().st_mtime < ttl:
+            return json.loads(MODEL_LIST_CACHE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        pass  # Missing or unreadable cache, fetch below
+
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    available = [
+        m.name for m in genai.list_models()
+        if "generateContent" in m.supported_generation_methods
+    ]
+
+    try:
+        MODEL_LIST_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        MODEL_LIST_CACHE.write_text(json.dumps(available), encoding="utf-8")
+    except OSError:
+        pass  # Caching is best-effort
+
+    return available
 
 
 def get_llm(
@@ -17,12 +59,54 @@ def get_llm(
     **kwargs
 ) -> BaseChatModel:
     """
-    Create a Gemini chat model instance with smart fallbacks.
+    Get a Gemini chat model instance with smart fallbacks.
     Works with the latest v1 API and model naming (gemini-1.5 / gemini-2.x).
+
+    Models without extra kwargs are created once per (model_name, temperature)
+    and shared, so graph nodes reuse the same client and its connections.
+    """
+    if not kwargs:
+        return _get_cached_llm(model_name, temperature)
+
+    return _create_llm(model_name, temperature, **kwargs)
+
+
+@functools.lru_cache(maxsize=1)
+def get_rate_limiter():
+    """
+    Get the rate limiter shared by all chat models in this process.
+
+    Returns None when LLM_REQUESTS_PER_MINUTE is 0 (no limit).
     """
+    if LLM_REQUESTS_PER_MINUTE <= 0:
+        return None
+
+    from langchain_core.rate_limiters import InMemoryRateLimiter
+
+    return InMemoryRateLimiter(
+        requests_per_second=LLM_REQUESTS_PER_MINUTE / 60,
+        check_every_n_seconds=0.05,
+        max_bucket_size=LLM_MAX_BURST,
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _get_cached_llm(model_name: Optional[str], temperature: Optional[float]) -> BaseChatModel:
+    """Create a chat model once per argument combination."""
+    return _create_llm(model_name, temperature)
+
+
+def _create_llm(
+    model_name: Optional[str] = None,
+    temperature: Optional[float] = None,
+    **kwargs
+) -> BaseChatModel:
+    """Create a new Gemini chat model, falling back to available models."""
     import os
     from langchain_google_genai import ChatGoogleGenerativeAI
 
+    kwargs.setdefault("rate_limiter", get_rate_limiter())
+
     api_key = os.getenv("GEMINI_API_KEY") or GEMINI_API_KEY
     if not api_key:
         raise ValueError("❌ GEMINI_API_KEY not set. Add it to .env or environment variables.")
@@ -38,11 +122,8 @@ def get_llm(
 
     # try to detect available models
     try:
-        import google.generativeai as genai
-        genai.configure(api_key=api_key)
-        all_models = [m for m in genai.list_models() if "generateContent" in m.supported_generation_methods]
-        available = [m.name for m in all_models]
-        print(f"📋 Found {len(available)} Gemini models via API")
+        available = get_available_models(api_key)
+        print(f"📋 Found {len(available)} Gemini models")
 
         # Normalize requested name (ensure "models/" prefix)
         normalized = model_name if model_name.startswith("models/") else f"models/{model_name}"
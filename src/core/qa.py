@@ -10,8 +10,10 @@ from pathlib import Path
 # Add root directory to path for config import
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from config import ENABLE_SEMANTIC_CACHE
 from .retriever import get_retriever
 from .llm import get_llm
+from .semantic_cache import get_semantic_cache, mentions_other_jurisdiction
 
 
 # Prompt template for tenancy law QA
@@ -45,14 +47,17 @@ def format_docs(docs):
     return "\n\n".join(formatted)
 
 
+# Keywords that mark a question as being about tenancy law
+TENANCY_KEYWORDS = (
+    "rent", "tenant", "landlord", "lease", "eviction", "deposit",
+    "ontario", "rta", "residential tenancies", "rental", "housing"
+)
+
+
 def is_tenancy_question(question: str) -> bool:
     """Simple check if question is about Ontario tenancy law."""
     question_lower = question.lower()
-    tenancy_keywords = [
-        "rent", "tenant", "landlord", "lease", "eviction", "deposit",
-        "ontario", "rta", "residential tenancies", "rental", "housing"
-    ]
-    return any(keyword in question_lower for keyword in tenancy_keywords)
+    return any(keyword in question_lower for keyword in TENANCY_KEYWORDS)
 
 
 def get_answer(
@@ -94,6 +99,22 @@ def get_answer(
     
     # Retrieve documents
     retriever = get_retriever(k=k, filter={"jurisdiction": "Ontario"})
+
+    # Standalone questions (no chat history) can reuse the answer to an
+    # earlier paraphrase asked with the same model, temperature and k, unless
+    # they name another jurisdiction; the question embedding is also used for
+    # retrieval
+    semantic_cache = None
+    query_embedding = None
+    if ENABLE_SEMANTIC_CACHE and not chat_history and not mentions_other_jurisdiction(question):
+        semantic_cache = get_semantic_cache(("get_answer", model_name, temperature, k))
+        query_embedding = retriever.vectorstore.embeddings.embed_query(question)
+
+        cached = semantic_cache.lookup(query_embedding)
+        if cached is not None:
+            print("⚡ Semantic cache hit")
+            # Copy, so callers changing the result don't change the cache
+            return {**cached, "sources": list(cached["sources"])}
     
     # Enhance query with chat history if available
     query = question
@@ -105,7 +126,12 @@ def get_answer(
         ])
         query = f"Given this conversation:\n{history_context}\n\nCurrent question: {question}"
     
-    docs = retriever.invoke(query)
+    if query_embedding is not None:
+        docs = retriever.vectorstore.similarity_search_by_vector(
+            query_embedding, **retriever.search_kwargs
+        )
+    else:
+        docs = retriever.invoke(query)
     
     if not docs:
         return {
@@ -144,10 +170,15 @@ Could you please:
     if not isinstance(answer, str):
         answer = str(answer)
     
-    return {
+    result = {
         "answer": answer,
         "sources": docs,
         "is_relevant": True,
         "needs_clarification": False,
     }
 
+    if semantic_cache is not None:
+        semantic_cache.add(query_embedding, {**result, "sources": list(docs)})
+
+    return result
+
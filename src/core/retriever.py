@@ -1,6 +1,12 @@
 """Retriever configuration for RAG."""
 
+import asyncio
+import functools
+from typing import List
+
+from langchain_core.documents import Document
 from langchain_core.retrievers import BaseRetriever
+from langchain_core.vectorstores import VectorStoreRetriever
 from .vectorstore import get_vectorstore
 
 
@@ -18,13 +24,36 @@ def get_retriever(
 
     Returns:
         Configured retriever
-    """
-    vectorstore = get_vectorstore()
 
+    Retrievers without extra search_kwargs are cached per (k, filter), so
+    graph nodes share one retriever (and its vector store) across queries.
+    """
     # Default filter for Ontario jurisdiction
     if filter is None:
         filter = {"jurisdiction": "Ontario"}
 
+    if search_kwargs is None:
+        filter_key = tuple(sorted(filter.items()))
+        try:
+            hash(filter_key)
+        except TypeError:
+            pass  # Unhashable filter values (e.g. "$in" lists), build uncached
+        else:
+            return _get_cached_retriever(k, filter_key)
+
+    return _build_retriever(k, filter, search_kwargs)
+
+
+@functools.lru_cache(maxsize=16)
+def _get_cached_retriever(k: int, filter_key: tuple) -> BaseRetriever:
+    """Build a retriever once per (k, filter) combination."""
+    return _build_retriever(k, dict(filter_key), None)
+
+
+def _build_retriever(k: int, filter: dict, search_kwargs: dict) -> BaseRetriever:
+    """Create a similarity retriever over the Pinecone vector store."""
+    vectorstore = get_vectorstore()
+
     # Build search kwargs
     if search_kwargs is None:
         search_kwargs = {}
@@ -41,3 +70,28 @@ def get_retriever(
     print(f"✓ Retriever configured (k={k}, filter={filter})")
 
     return retriever
+
+
+async def aembed_and_search_many(
+    retriever: VectorStoreRetriever,
+    queries: List[str],
+) -> List[List[Document]]:
+    """Retrieve documents for several queries with a single embedding batch.
+
+    All queries are embedded in one embed_documents call, then the vector
+    searches run concurrently using the retriever's search settings.
+
+    Args:
+        retriever: Retriever from get_retriever
+        queries: Query texts
+
+    Returns:
+        Retrieved documents for each query, in query order
+    """
+    vectorstore = retriever.vectorstore
+    query_embeddings = await vectorstore.embeddings.aembed_documents(queries)
+
+    return await asyncio.gather(*(
+        vectorstore.asimilarity_search_by_vector(embedding, **retriever.search_kwargs)
+        for embedding in query_embeddings
+    ))
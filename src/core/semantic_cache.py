@@ -0,0 +1,160 @@
+"""Semantic answer cache for paraphrased questions."""
+
+import functools
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Optional
+
+import numpy as np
+
+# Add root directory to path for config import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from config import (
+    EMBEDDING_DIMENSION,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_MAX_ENTRIES,
+)
+
+
+# Places whose tenancy law is not Ontario's. Questions naming one embed close
+# to their Ontario counterparts ("rent increase in Alberta" vs "in Ontario"),
+# so semantic caches must not answer them from, or store them for, each other
+OTHER_JURISDICTIONS = (
+    # Other provinces and territories, and their larger cities
+    "British Columbia", "Alberta", "Saskatchewan", "Manitoba", "Quebec", "Québec",
+    "New Brunswick", "Nova Scotia", "Prince Edward Island", "Newfoundland", "Labrador",
+    "Yukon", "Northwest Territories", "Nunavut",
+    "Vancouver", "Victoria", "Calgary", "Edmonton", "Regina", "Saskatoon", "Winnipeg",
+    "Montreal", "Montréal", "Halifax", "Fredericton", "Moncton", "Charlottetown",
+    "Whitehorse", "Yellowknife", "Iqaluit",
+    # Other countries
+    "United States", "America", "American", "United Kingdom", "England", "Scotland",
+    "Wales", "Ireland", "Australia", "New Zealand", "India", "France", "Germany",
+    # US states
+    "Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut",
+    "Delaware", "Florida", "Georgia", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa",
+    "Kansas", "Kentucky", "Louisiana", "Maine", "Maryland", "Massachusetts", "Michigan",
+    "Minnesota", "Mississippi", "Missouri", "Montana", "Nebraska", "Nevada",
+    "New Hampshire", "New Jersey", "New Mexico", "New York", "North Carolina",
+    "North Dakota", "Ohio", "Oklahoma", "Oregon", "Pennsylvania", "Rhode Island",
+    "South Carolina", "South Dakota", "Tennessee", "Texas", "Utah", "Vermont",
+    "Virginia", "Washington", "West Virginia", "Wisconsin", "Wyoming",
+)
+_RE_OTHER_JURISDICTION = re.compile(
+    r"\b(?:" + "|".join(re.escape(name) for name in OTHER_JURISDICTIONS) + r")\b",
+    re.IGNORECASE,
+)
+# Abbreviations, matched case-sensitively ("US", not "us")
+_RE_OTHER_JURISDICTION_ABBR = re.compile(r"\b(?:BC|B\.C\.|AB|QC|PEI|NWT|USA?|U\.S\.A?\.?|UK|U\.K\.)(?!\w)")
+
+
+def mentions_other_jurisdiction(question: str) -> bool:
+    """Check whether a question names a place other than Ontario.
+
+    Such questions bypass the semantic caches (see OTHER_JURISDICTIONS).
+    """
+    return bool(
+        _RE_OTHER_JURISDICTION.search(question)
+        or _RE_OTHER_JURISDICTION_ABBR.search(question)
+    )
+
+
+class SemanticCache:
+    """In-memory cache of answers keyed by normalized question embeddings.
+
+    A lookup returns the answer stored for the most similar earlier question
+    when its cosine similarity reaches the threshold, so paraphrases like
+    "Can a landlord raise rent?" / "Is a rent increase allowed?" skip the LLM.
+    Once full, the oldest entries are overwritten; with a ttl, entries older
+    than ttl seconds are also ignored.
+    """
+
+    def __init__(
+        self,
+        threshold: float = None,
+        max_entries: int = None,
+        dimension: int = None,
+        ttl: float = None,
+    ):
+        """Initialize an empty cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit (default: from config)
+            max_entries: Maximum number of cached answers (default: from config)
+            dimension: Embedding dimension (default: from config)
+            ttl: Seconds an entry stays valid (default: no expiry)
+        """
+        self.threshold = threshold if threshold is not None else SEMANTIC_CACHE_THRESHOLD
+        self.max_entries = max_entries or SEMANTIC_CACHE_MAX_ENTRIES
+        self.dimension = dimension or EMBEDDING_DIMENSION
+        self.ttl = ttl
+
+        self._vectors: Optional[np.ndarray] = None  # Allocated on first add
+        self._added_at: Optional[np.ndarray] = None
+        self._values: List[Any] = []
+        self._next = 0
+        self._lock = threading.Lock()  # Caches are shared across threads
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def lookup(self, embedding: List[float]) -> Optional[Any]:
+        """Return the cached answer for a similar question, if any.
+
+        Args:
+            embedding: Normalized question embedding
+
+        Returns:
+            Cached answer, or None on a miss
+        """
+        query = np.asarray(embedding, dtype=np.float32)
+
+        with self._lock:
+            if not self._values:
+                return None
+
+            count = len(self._values)
+            scores = self._vectors[:count] @ query
+            if self.ttl is not None:
+                scores[time.monotonic() - self._added_at[:count] > self.ttl] = -np.inf
+            best = int(np.argmax(scores))
+
+            if scores[best] >= self.threshold:
+                return self._values[best]
+            return None
+
+    def add(self, embedding: List[float], value: Any) -> None:
+        """Cache an answer under its question embedding.
+
+        Args:
+            embedding: Normalized question embedding
+            value: Answer to return for similar questions
+        """
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, self.dimension), dtype=np.float32)
+                self._added_at = np.zeros(self.max_entries)
+
+            self._vectors[self._next] = embedding
+            self._added_at[self._next] = time.monotonic()
+            if len(self._values) < self.max_entries:
+                self._values.append(value)
+            else:
+                self._values[self._next] = value
+
+            self._next = (self._next + 1) % self.max_entries
+
+
+@functools.lru_cache(maxsize=8)
+def get_semantic_cache(key: tuple = ()) -> SemanticCache:
+    """Get the process-wide semantic cache for one answer configuration.
+
+    Args:
+        key: Everything besides the question that the cached answers depend
+            on (e.g. model, temperature and k); each key gets its own cache
+    """
+    return SemanticCache()
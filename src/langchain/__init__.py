@@ -1,13 +1,32 @@
 """LangChain and LangGraph components for RAG agent."""
 
 from .chains import get_qa_chain
-from .rag_graph import create_rag_graph, query_with_graph
-from .contract_graph import analyze_contract
+from .rag_graph import (
+    create_rag_graph,
+    get_rag_graph,
+    warm_up_rag_graph,
+    query_with_graph,
+    aquery_with_graph,
+)
+from .contract_graph import (
+    analyze_contract,
+    aanalyze_contract,
+    astream_contract_analysis,
+    analyze_contract_batch,
+    aanalyze_contract_batch,
+)
 
 __all__ = [
     "get_qa_chain",
     "create_rag_graph",
+    "get_rag_graph",
+    "warm_up_rag_graph",
     "query_with_graph",
+    "aquery_with_graph",
     "analyze_contract",
+    "aanalyze_contract",
+    "astream_contract_analysis",
+    "analyze_contract_batch",
+    "aanalyze_contract_batch",
 ]
 
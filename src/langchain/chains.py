@@ -1,17 +1,21 @@
 """LangChain chains for RAG question answering."""
 
+import functools
 import sys
 from pathlib import Path
+from typing import AsyncIterator, Iterator
 
 # Add root directory to path for config import
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables import RunnableGenerator, RunnablePassthrough
 
+from config import ENABLE_SEMANTIC_CACHE
 from src.core.retriever import get_retriever
 from src.core.llm import get_llm
+from src.core.semantic_cache import SemanticCache, mentions_other_jurisdiction
 
 
 # Prompt template for tenancy law QA
@@ -61,7 +65,33 @@ def get_qa_chain(
 
     Returns:
         Configured LCEL chain
+
+    Chains without a filter are cached per (model_name, temperature, k), so
+    repeated calls reuse the same LLM client and retriever, and (with
+    ENABLE_SEMANTIC_CACHE) answer paraphrases of earlier questions from a
+    semantic cache.
     """
+    if filter is None:
+        return _get_cached_qa_chain(model_name, temperature, k)
+
+    return _build_qa_chain(model_name, temperature, k, filter)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_cached_qa_chain(model_name: str, temperature: float, k: int):
+    """Build an unfiltered QA chain once per argument combination."""
+    chain = _build_qa_chain(model_name, temperature, k, None)
+
+    # Only long-lived chains get a semantic cache; a filtered chain is built
+    # per call, so its cache would never be hit
+    if ENABLE_SEMANTIC_CACHE:
+        embeddings = get_retriever(k=k).vectorstore.embeddings
+        chain = _with_semantic_cache(chain, embeddings)
+    return chain
+
+
+def _build_qa_chain(model_name: str, temperature: float, k: int, filter: dict):
+    """Assemble the retriever, prompt and LLM into an LCEL chain."""
     # Get LLM (uses global config from config.py)
     llm = get_llm(model_name=model_name, temperature=temperature)
     
@@ -88,3 +118,58 @@ def get_qa_chain(
 
     return chain
 
+
+def _with_semantic_cache(chain, embeddings):
+    """Wrap a QA chain so paraphrases of earlier questions reuse their answers.
+
+    Each chain gets its own cache, since answers depend on the chain's model
+    and k as well as the question. Misses stream the chain's tokens as they
+    are generated; hits return the cached answer as a single chunk.
+    Questions naming another jurisdiction bypass the cache entirely.
+    """
+    cache = SemanticCache()
+
+    def answer(questions: Iterator[str]) -> Iterator[str]:
+        question = None
+        for chunk in questions:
+            question = chunk if question is None else question + chunk
+
+        if mentions_other_jurisdiction(question):
+            yield from chain.stream(question)
+            return
+
+        embedding = embeddings.embed_query(question)
+        cached = cache.lookup(embedding)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        for chunk in chain.stream(question):
+            chunks.append(chunk)
+            yield chunk
+        cache.add(embedding, "".join(chunks))
+
+    async def aanswer(questions: AsyncIterator[str]) -> AsyncIterator[str]:
+        question = None
+        async for chunk in questions:
+            question = chunk if question is None else question + chunk
+
+        if mentions_other_jurisdiction(question):
+            async for chunk in chain.astream(question):
+                yield chunk
+            return
+
+        embedding = await embeddings.aembed_query(question)
+        cached = cache.lookup(embedding)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        async for chunk in chain.astream(question):
+            chunks.append(chunk)
+            yield chunk
+        cache.add(embedding, "".join(chunks))
+
+    return RunnableGenerator(answer, aanswer)
@@ -1,5 +1,10 @@
 """LangGraph workflow for contract analysis and compliance checking."""
 
+import asyncio
+import functools
+import itertools
+import logging
+import re
 import sys
 from pathlib import Path
 
@@ -7,11 +12,116 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from typing import TypedDict, Annotated, Sequence, List, Dict
-from langgraph.graph import StateGraph, END
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
-from src.core.retriever import get_retriever
+from langgraph.graph import StateGraph, START, END
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
+from src.core.retriever import get_retriever, aembed_and_search_many
 from src.core.llm import get_llm
 
+logger = logging.getLogger(__name__)
+
+
+# Static instructions are sent as the system message, ahead of the contract
+# text, so every request shares the same prompt prefix (and the provider's
+# prefix cache)
+EXTRACT_CLAUSES_SYSTEM_PROMPT = """Analyze the tenancy contract given by the user and extract key clauses.
+
+Identify and list:
+1. Rent amount and payment terms
+2. Lease duration and renewal terms
+3. Security deposit details
+4. Maintenance and repair responsibilities
+5. Termination and eviction clauses
+6. Any unusual or concerning clauses
+
+Format as a bulleted list."""
+
+COMPLIANCE_SYSTEM_PROMPT = """You are a legal expert in Ontario tenancy law. Analyze the contract given by the user for compliance issues, using the relevant Ontario Residential Tenancies Act sections provided with it.
+
+Provide a clear, structured analysis in markdown format. Identify:
+
+1. **Clauses that Violate Ontario Tenancy Law** - List specific violations with RTA section citations
+2. **Missing Mandatory Clauses** - List what's required but missing
+3. **Unfair or Illegal Terms** - Identify problematic terms
+4. **Clauses that Favor One Party Excessively** - Point out imbalanced terms
+
+Format your response as markdown with clear headings and bullet points. Be concise but thorough. For each issue, cite the specific RTA section violated.
+
+Keep the response focused and well-organized."""
+
+RECOMMENDATIONS_SYSTEM_PROMPT = """Review the tenancy contract given by the user against the Ontario tenancy laws provided with it, and provide actionable recommendations in a clear, structured markdown format.
+
+Provide recommendations organized as follows:
+
+1. **Specific Changes Needed** - List the key changes required to comply with Ontario law
+2. **Suggested Wording** - Provide improved wording for problematic clauses
+3. **Additional Protections** - Suggest additional clauses or protections that should be added
+4. **Implementation Timeline** - Provide a realistic timeline for making these changes
+
+Format your response as markdown with clear headings and bullet points. Be practical and actionable. Keep it concise but comprehensive."""
+
+
+# Key areas every contract is checked against; fixed, so law retrieval does
+# not wait for clause extraction
+ANALYSIS_QUESTIONS = (
+    "rent increases and notice requirements",
+    "tenant rights regarding maintenance",
+    "landlord's right to enter the property",
+    "security deposit return conditions",
+    "lease termination procedures",
+)
+
+
+# Contract text sent to the LLM nodes is capped at this many characters: the
+# opening of the contract plus the paragraphs that mention key clause terms
+CONTRACT_EXCERPT_CHARS = 3000
+_RE_KEY_CLAUSE_TERM = re.compile(r"rent|deposit|terminat|notice|maintenance|repair|evict", re.IGNORECASE)
+_RE_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+# Referenced-law filtering for the final report: sections whose titles
+# mention these are not about standard residential tenancies
+REPORT_EXCLUDED_KEYWORDS = ('care home', 'care service', 'superintendent', 'offence', 'harassment')
+
+# Common residential tenancy sections (listed first in the report)
+REPORT_PRIORITY_SECTIONS = frozenset(
+    ['5', '14', '20', '26', '33', '37', '48', '49', '50', '51', '58', '59', '60', '61', '62', '64', '67', '69', '83']
+    + [str(number) for number in range(105, 151)]
+)
+
+
+def build_contract_excerpt(contract_text: str, max_chars: int = CONTRACT_EXCERPT_CHARS) -> str:
+    """Select the parts of a contract the analysis prompts should see.
+
+    Short contracts are returned whole. Longer ones keep their first half of
+    the budget (parties, premises, term) and fill the rest with the later
+    paragraphs that mention the most key clause terms, in contract order.
+    """
+    if len(contract_text) <= max_chars:
+        return contract_text
+
+    head_chars = max_chars // 2
+    head = contract_text[:head_chars]
+
+    paragraphs = _RE_PARAGRAPH_BREAK.split(contract_text[head_chars:])
+    ranked = sorted(
+        range(len(paragraphs)),
+        key=lambda i: len(_RE_KEY_CLAUSE_TERM.findall(paragraphs[i])),
+        reverse=True,
+    )
+
+    budget = max_chars - head_chars
+    selected = []
+    for i in ranked:
+        paragraph = paragraphs[i].strip()
+        if not paragraph or len(paragraph) > budget:
+            continue
+        selected.append(i)
+        budget -= len(paragraph) + 2
+
+    if not selected:
+        return contract_text[:max_chars]
+
+    return "\n\n".join([head] + [paragraphs[i].strip() for i in sorted(selected)])
+
 
 def format_docs(docs):
     """Format retrieved documents into context string."""
@@ -32,6 +142,7 @@ def format_docs(docs):
 class ContractAnalysisState(TypedDict):
     """State for the contract analysis graph."""
     contract_text: str
+    contract_excerpt: str
     contract_type: str
     analysis_questions: List[str]
     retrieved_laws: list
@@ -41,30 +152,25 @@ class ContractAnalysisState(TypedDict):
     messages: Annotated[Sequence[BaseMessage], "Chat history"]
 
 
-def extract_contract_clauses(state: ContractAnalysisState) -> ContractAnalysisState:
-    """Extract and categorize key clauses from the contract."""
-    contract_text = state["contract_text"]
+async def extract_contract_clauses(state: ContractAnalysisState) -> dict:
+    """Extract and categorize key clauses from the contract.
 
-    print("🔍 Extracting contract clauses...")
-
-    llm = get_llm()
+    Runs in parallel with retrieve_relevant_laws, so it returns only the
+    state key it writes.
+    """
+    contract_excerpt = state["contract_excerpt"]
 
-    prompt = f"""Analyze this tenancy contract and extract key clauses.
+    logger.debug("Extracting contract clauses")
 
-Contract:
-{contract_text[:3000]}...
+    llm = get_llm()
 
-Identify and list:
-1. Rent amount and payment terms
-2. Lease duration and renewal terms
-3. Security deposit details
-4. Maintenance and repair responsibilities
-5. Termination and eviction clauses
-6. Any unusual or concerning clauses
+    prompt = f"""Contract:
+{contract_excerpt}..."""
 
-Format as a bulleted list."""
-
-    response = llm.invoke(prompt)
+    response = await llm.ainvoke([
+        SystemMessage(content=EXTRACT_CLAUSES_SYSTEM_PROMPT),
+        HumanMessage(content=prompt),
+    ])
     
     # Extract content from response
     if hasattr(response, 'content'):
@@ -74,82 +180,67 @@ Format as a bulleted list."""
     else:
         response_content = str(response)
 
-    analysis_questions = [
-        "rent increases and notice requirements",
-        "tenant rights regarding maintenance",
-        "landlord's right to enter the property",
-        "security deposit return conditions",
-        "lease termination procedures"
-    ]
-
-    state["analysis_questions"] = analysis_questions
-    state["messages"] = [
-        HumanMessage(content=prompt),
-        AIMessage(content=response_content)
-    ]
+    logger.info("Contract clauses extracted")
 
-    print(f"✓ Extracted {len(analysis_questions)} key areas for analysis")
+    return {
+        "messages": [
+            HumanMessage(content=prompt),
+            AIMessage(content=response_content)
+        ]
+    }
 
-    return state
 
+async def retrieve_relevant_laws(state: ContractAnalysisState) -> dict:
+    """Retrieve relevant laws for each contract clause.
 
-def retrieve_relevant_laws(state: ContractAnalysisState) -> ContractAnalysisState:
-    """Retrieve relevant laws for each contract clause."""
+    All questions are embedded in one batch and the per-question searches
+    run concurrently, so the node waits for roughly one vector store
+    round-trip instead of one per question. Runs in parallel with
+    extract_contract_clauses and returns only the state key it writes.
+    """
     questions = state["analysis_questions"]
 
-    print("📚 Retrieving relevant tenancy laws...")
+    logger.debug("Retrieving relevant tenancy laws")
 
     retriever = get_retriever(k=3)
 
-    all_docs = []
-    for question in questions:
-        docs = retriever.invoke(question)
-        all_docs.extend(docs)
+    results = await aembed_and_search_many(retriever, questions)
+    all_docs = list(itertools.chain.from_iterable(results))
 
-    unique_docs = []
-    seen_sections = set()
+    # Keep the first document retrieved per section, in retrieval order
+    docs_by_section = {}
     for doc in all_docs:
-        section = doc.metadata.get('section_number')
-        if section not in seen_sections:
-            unique_docs.append(doc)
-            seen_sections.add(section)
+        docs_by_section.setdefault(doc.metadata.get('section_number'), doc)
+    unique_docs = list(docs_by_section.values())
 
-    state["retrieved_laws"] = unique_docs[:10]
+    logger.info("Retrieved %d unique law sections", len(unique_docs))
 
-    print(f"✓ Retrieved {len(unique_docs)} unique law sections")
+    return {"retrieved_laws": unique_docs[:10]}
 
-    return state
 
+async def check_compliance(state: ContractAnalysisState) -> dict:
+    """Check contract compliance against Ontario tenancy laws.
 
-def check_compliance(state: ContractAnalysisState) -> ContractAnalysisState:
-    """Check contract compliance against Ontario tenancy laws."""
-    contract_text = state["contract_text"]
+    Runs in parallel with generate_recommendations, so it returns only the
+    state key it writes.
+    """
+    contract_excerpt = state["contract_excerpt"]
     laws_context = format_docs(state["retrieved_laws"])
 
-    print("⚖️ Checking compliance...")
+    logger.debug("Checking compliance")
 
     llm = get_llm()
 
-    prompt = f"""You are a legal expert in Ontario tenancy law. Analyze this contract for compliance issues.
-
-Contract Text:
-{contract_text[:3000]}...
+    prompt = f"""Contract Text:
+{contract_excerpt}...
 
 Relevant Ontario Residential Tenancies Act Sections:
-{laws_context}
-
-Provide a clear, structured analysis in markdown format. Identify:
-
-1. **Clauses that Violate Ontario Tenancy Law** - List specific violations with RTA section citations
-2. **Missing Mandatory Clauses** - List what's required but missing
-3. **Unfair or Illegal Terms** - Identify problematic terms
-4. **Clauses that Favor One Party Excessively** - Point out imbalanced terms
+{laws_context}"""
 
-Format your response as markdown with clear headings and bullet points. Be concise but thorough. For each issue, cite the specific RTA section violated.
-
-Keep the response focused and well-organized."""
-
-    response = llm.invoke(prompt)
+    response = await llm.ainvoke([
+        SystemMessage(content=COMPLIANCE_SYSTEM_PROMPT),
+        HumanMessage(content=prompt),
+    ])
     
     # Extract content from response
     if hasattr(response, 'content'):
@@ -166,40 +257,35 @@ Keep the response focused and well-organized."""
         }
     ]
 
-    state["compliance_issues"] = compliance_issues
+    logger.info("Compliance check complete")
 
-    print(f"✓ Compliance check complete")
+    return {"compliance_issues": compliance_issues}
 
-    return state
 
+async def generate_recommendations(state: ContractAnalysisState) -> dict:
+    """Generate recommendations for contract improvements.
 
-def generate_recommendations(state: ContractAnalysisState) -> ContractAnalysisState:
-    """Generate recommendations for contract improvements."""
-    issues = state["compliance_issues"]
+    Works from the contract and the retrieved laws (not the compliance
+    findings) so it can run in parallel with check_compliance; returns only
+    the state key it writes.
+    """
+    contract_excerpt = state["contract_excerpt"]
     laws_context = format_docs(state["retrieved_laws"])
 
-    print("💡 Generating recommendations...")
+    logger.debug("Generating recommendations")
 
     llm = get_llm(temperature=0.2)
 
-    prompt = f"""Based on the compliance issues found, provide actionable recommendations in a clear, structured markdown format.
-
-Issues Found:
-{issues[0]['description'] if issues else 'None'}
+    prompt = f"""Contract Text:
+{contract_excerpt}...
 
 Relevant Laws:
-{laws_context}
-
-Provide recommendations organized as follows:
+{laws_context}"""
 
-1. **Specific Changes Needed** - List the key changes required to comply with Ontario law
-2. **Suggested Wording** - Provide improved wording for problematic clauses
-3. **Additional Protections** - Suggest additional clauses or protections that should be added
-4. **Implementation Timeline** - Provide a realistic timeline for making these changes
-
-Format your response as markdown with clear headings and bullet points. Be practical and actionable. Keep it concise but comprehensive."""
-
-    response = llm.invoke(prompt)
+    response = await llm.ainvoke([
+        SystemMessage(content=RECOMMENDATIONS_SYSTEM_PROMPT),
+        HumanMessage(content=prompt),
+    ])
     
     # Extract content from response
     if hasattr(response, 'content'):
@@ -209,11 +295,9 @@ Format your response as markdown with clear headings and bullet points. Be pract
     else:
         recommendation_text = str(response)
 
-    state["recommendations"] = [recommendation_text]
-
-    print("✓ Recommendations generated")
+    logger.info("Recommendations generated")
 
-    return state
+    return {"recommendations": [recommendation_text]}
 
 
 def generate_final_report(state: ContractAnalysisState) -> ContractAnalysisState:
@@ -223,7 +307,7 @@ def generate_final_report(state: ContractAnalysisState) -> ContractAnalysisState
     recommendations = state.get("recommendations", [])
     laws = state.get("retrieved_laws", [])
 
-    print("📄 Generating final report...")
+    logger.debug("Generating final report")
 
     # Format issues
     issues_text = "No major compliance issues found."
@@ -283,42 +367,40 @@ This contract has been analyzed against the **Ontario Residential Tenancies Act,
 """
 
     if laws and len(laws) > 0:
-        # Filter out irrelevant sections (like care homes, etc.) and prioritize relevant ones
-        relevant_laws = []
-        excluded_keywords = ['care home', 'care service', 'superintendent', 'offence', 'harassment']
-        
-        # Common residential tenancy sections (prioritize these)
-        priority_sections = {'5', '14', '20', '26', '33', '37', '48', '49', '50', '51', '58', '59', '60', '61', '62', '64', '67', '69', '83', '105', '106', '107', '108', '109', '110', '111', '112', '113', '114', '115', '116', '117', '118', '119', '120', '121', '122', '123', '124', '125', '126', '127', '128', '129', '130', '131', '132', '133', '134', '135', '136', '137', '138', '139', '140', '141', '142', '143', '144', '145', '146', '147', '148', '149', '150'}
-        
-        priority_docs = []
-        other_docs = []
+        # Filter out irrelevant sections (like care homes, etc.) and prioritize
+        # relevant ones; each law's metadata is read once into a
+        # (section_number, subsection_number, section_title) row
+        priority_rows = []
+        other_rows = []
         
         for doc in laws:
             metadata = doc.metadata
-            section_title = metadata.get('section_title', '').lower()
-            section_number = str(metadata.get('section_number', ''))
+            row = (
+                metadata.get('section_number', 'N/A'),
+                metadata.get('subsection_number'),
+                metadata.get('section_title', ''),
+            )
+            section_title = row[2].lower()
             
             # Skip sections that are clearly not relevant to standard residential tenancies
-            if any(keyword in section_title for keyword in excluded_keywords):
+            if any(keyword in section_title for keyword in REPORT_EXCLUDED_KEYWORDS):
                 continue
             
             # Prioritize common residential tenancy sections
-            if section_number in priority_sections:
-                priority_docs.append(doc)
+            if str(metadata.get('section_number', '')) in REPORT_PRIORITY_SECTIONS:
+                priority_rows.append(row)
             else:
-                other_docs.append(doc)
+                other_rows.append(row)
         
         # Combine: priority first, then others, limit to 5
-        relevant_laws = (priority_docs + other_docs)[:5]
+        relevant_laws = (priority_rows + other_rows)[:5]
         
         if relevant_laws:
-            for i, doc in enumerate(relevant_laws, 1):
-                metadata = doc.metadata
-                section = f"Section {metadata.get('section_number', 'N/A')}"
-                if metadata.get('subsection_number'):
-                    section += f" - Subsection {metadata.get('subsection_number')}"
+            for i, (section_number, subsection_number, section_title) in enumerate(relevant_laws, 1):
+                section = f"Section {section_number}"
+                if subsection_number:
+                    section += f" - Subsection {subsection_number}"
 
-                section_title = metadata.get('section_title', '')
                 report += f"\n{i}. **{section}** - {section_title}"
         else:
             report += "\nNo directly relevant sections found in the retrieved documents."
@@ -329,7 +411,7 @@ This contract has been analyzed against the **Ontario Residential Tenancies Act,
 
     state["analysis_result"] = report
 
-    print("✓ Report generated")
+    logger.info("Report generated")
 
     return state
 
@@ -348,23 +430,56 @@ def create_contract_analysis_graph():
     workflow.add_node("generate_recommendations", generate_recommendations)
     workflow.add_node("generate_report", generate_final_report)
 
-    workflow.set_entry_point("extract_clauses")
-    workflow.add_edge("extract_clauses", "retrieve_laws")
+    # Clause extraction (an LLM call) and law retrieval are independent, so
+    # both start at once; the compliance check and recommendations only need
+    # the retrieved laws, so they fan out after retrieval while extraction
+    # may still be running. Everything joins before the report
+    workflow.add_edge(START, "extract_clauses")
+    workflow.add_edge(START, "retrieve_laws")
     workflow.add_edge("retrieve_laws", "check_compliance")
-    workflow.add_edge("check_compliance", "generate_recommendations")
-    workflow.add_edge("generate_recommendations", "generate_report")
+    workflow.add_edge("retrieve_laws", "generate_recommendations")
+    workflow.add_edge(
+        ["extract_clauses", "check_compliance", "generate_recommendations"],
+        "generate_report",
+    )
     workflow.add_edge("generate_report", END)
 
     app = workflow.compile()
 
-    print("✓ Contract analysis graph compiled")
+    logger.info("Contract analysis graph compiled")
 
     return app
 
 
+@functools.lru_cache(maxsize=1)
+def get_contract_analysis_graph():
+    """Get the contract analysis workflow graph, compiled once per process.
+
+    Returns:
+        Compiled LangGraph workflow
+    """
+    return create_contract_analysis_graph()
+
+
 def analyze_contract(contract_text: str, contract_type: str = "Residential Lease") -> dict:
     """Analyze a contract for compliance with Ontario tenancy laws.
 
+    Synchronous wrapper around aanalyze_contract; use that one from code
+    that already runs an event loop.
+
+    Args:
+        contract_text: Full text of the contract
+        contract_type: Type of contract (default: Residential Lease)
+
+    Returns:
+        Analysis results with compliance issues and recommendations
+    """
+    return asyncio.run(aanalyze_contract(contract_text, contract_type))
+
+
+async def aanalyze_contract(contract_text: str, contract_type: str = "Residential Lease") -> dict:
+    """Analyze a contract for compliance with Ontario tenancy laws (async).
+
     Args:
         contract_text: Full text of the contract
         contract_type: Type of contract (default: Residential Lease)
@@ -372,18 +487,118 @@ def analyze_contract(contract_text: str, contract_type: str = "Residential Lease
     Returns:
         Analysis results with compliance issues and recommendations
     """
-    print("=" * 70)
-    print("📋 CONTRACT ANALYSIS")
-    print("=" * 70)
-    print(f"\nContract Type: {contract_type}")
-    print(f"Contract Length: {len(contract_text)} characters\n")
+    verbose = logger.isEnabledFor(logging.INFO)
+
+    if verbose:
+        print("=" * 70)
+        print("📋 CONTRACT ANALYSIS")
+        print("=" * 70)
+        print(f"\nContract Type: {contract_type}")
+        print(f"Contract Length: {len(contract_text)} characters\n")
+
+    graph = get_contract_analysis_graph()
+
+    result = await graph.ainvoke(_initial_contract_state(contract_text, contract_type))
 
-    graph = create_contract_analysis_graph()
+    if verbose:
+        print("\n" + "=" * 70)
+        print("✅ ANALYSIS COMPLETE")
+        print("=" * 70)
 
-    initial_state = {
+    return result
+
+
+async def astream_contract_analysis(contract_text: str, contract_type: str = "Residential Lease"):
+    """Analyze a contract, yielding each step's result as soon as it finishes.
+
+    Lets callers show progress while the slower LLM steps are still running;
+    the finished report is the analysis_result of the "generate_report" update.
+
+    Args:
+        contract_text: Full text of the contract
+        contract_type: Type of contract (default: Residential Lease)
+
+    Yields:
+        (node name, state update) pairs, in completion order
+    """
+    graph = get_contract_analysis_graph()
+
+    async for event in graph.astream(
+        _initial_contract_state(contract_text, contract_type),
+        stream_mode="updates",
+    ):
+        for node_name, update in event.items():
+            yield node_name, update
+
+
+def analyze_contract_batch(
+    contracts: List[str],
+    contract_type: str = "Residential Lease",
+    max_concurrency: int = 4,
+) -> List[dict]:
+    """Analyze several contracts (e.g. bulk uploads or overnight runs).
+
+    Synchronous wrapper around aanalyze_contract_batch.
+
+    Args:
+        contracts: Full text of each contract
+        contract_type: Type of contract (default: Residential Lease)
+        max_concurrency: Maximum number of contracts analyzed at once
+
+    Returns:
+        Analysis results for each contract, in input order
+    """
+    return asyncio.run(aanalyze_contract_batch(contracts, contract_type, max_concurrency))
+
+
+async def aanalyze_contract_batch(
+    contracts: List[str],
+    contract_type: str = "Residential Lease",
+    max_concurrency: int = 4,
+) -> List[dict]:
+    """Analyze several contracts through one shared graph run (async).
+
+    Contracts go through the graph's batch API, which overlaps their LLM and
+    vector store calls; max_concurrency keeps bulk jobs from exhausting the
+    API rate limit that interactive queries share.
+
+    Args:
+        contracts: Full text of each contract
+        contract_type: Type of contract (default: Residential Lease)
+        max_concurrency: Maximum number of contracts analyzed at once
+
+    Returns:
+        Analysis results for each contract, in input order
+    """
+    verbose = logger.isEnabledFor(logging.INFO)
+
+    if verbose:
+        print("=" * 70)
+        print(f"📋 BATCH CONTRACT ANALYSIS ({len(contracts)} contracts)")
+        print("=" * 70)
+
+    graph = get_contract_analysis_graph()
+
+    results = await graph.abatch(
+        [_initial_contract_state(text, contract_type) for text in contracts],
+        config={"max_concurrency": max_concurrency},
+    )
+
+    if verbose:
+        print("\n" + "=" * 70)
+        print("✅ BATCH ANALYSIS COMPLETE")
+        print("=" * 70)
+
+    return results
+
+
+def _initial_contract_state(contract_text: str, contract_type: str) -> dict:
+    """Build the starting graph state for one contract."""
+    return {
         "contract_text": contract_text,
+        "contract_excerpt": build_contract_excerpt(contract_text),
         "contract_type": contract_type,
-        "analysis_questions": [],
+        "analysis_questions": list(ANALYSIS_QUESTIONS),
         "retrieved_laws": [],
         "compliance_issues": [],
         "recommendations": [],
@@ -391,11 +606,3 @@ def analyze_contract(contract_text: str, contract_type: str = "Residential Lease
         "messages": [],
     }
 
-    result = graph.invoke(initial_state)
-
-    print("\n" + "=" * 70)
-    print("✅ ANALYSIS COMPLETE")
-    print("=" * 70)
-
-    return result
-
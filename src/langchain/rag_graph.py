@@ -1,5 +1,8 @@
 """LangGraph workflow for advanced RAG with routing and multi-step processing."""
 
+import asyncio
+import functools
+import logging
 import sys
 from pathlib import Path
 
@@ -7,13 +10,78 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from typing import TypedDict, Annotated, Sequence
-from langgraph.graph import StateGraph, END
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 
+import numpy as np
+from langgraph.graph import StateGraph, START, END
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
+
+from config import (
+    ENABLE_SEMANTIC_CACHE,
+    CLASSIFY_CACHE_THRESHOLD,
+    CLASSIFY_RELEVANT_SIMILARITY,
+    CLASSIFY_IRRELEVANT_SIMILARITY,
+    SUMMARIZE_MIN_CONTEXT_CHARS,
+)
 from src.core.retriever import get_retriever
 from src.core.llm import get_llm
+from src.core.semantic_cache import SemanticCache, mentions_other_jurisdiction
 from src.langchain.chains import format_docs
 
+logger = logging.getLogger(__name__)
+
+
+# Static instructions are sent as the system message, ahead of any per-query
+# text, so every request shares the same prompt prefix (and the provider's
+# prefix cache)
+CLASSIFY_SYSTEM_PROMPT = """You are a question classifier for an Ontario tenancy law assistant.
+
+Determine if the user's question is related to:
+- Ontario rental/tenancy law
+- Residential Tenancies Act (RTA) 2006
+- Landlord-tenant relationships in Ontario
+- Housing rights in Ontario
+- Lease agreements in Ontario
+- Rent, evictions, maintenance, deposits, etc. in Ontario
+
+Respond with ONLY:
+- "RELEVANT" if the question is about Ontario tenancy/rental law
+- "IRRELEVANT" if the question is about anything else (weather, sports, general chat, other provinces, other countries, non-housing topics, etc.)"""
+
+# Retrieval settings for retrieve_documents
+RETRIEVE_K = 7
+RETRIEVE_FILTER = {"jurisdiction": "Ontario"}
+
+# Reference questions for the embedding pre-classifier
+RELEVANT_QUESTION_EXAMPLES = (
+    "Can my landlord increase the rent in Ontario?",
+    "How much notice does a landlord need to give to end a tenancy?",
+    "Can my landlord ask for a security deposit or last month's rent?",
+    "Who is responsible for maintenance and repairs in my rental unit?",
+    "Can my landlord enter my apartment without notice?",
+    "How do I end my lease early?",
+    "What can I do about an eviction notice from my landlord?",
+    "Am I allowed to sublet my apartment under the Residential Tenancies Act?",
+)
+
+SUMMARIZE_SYSTEM_PROMPT = """Summarize the legal sections from the Ontario Residential Tenancies Act given by the user.
+Focus on key points, requirements, and conditions. Keep citations intact.
+
+Provide a concise summary maintaining all section numbers and key legal points."""
+
+GENERATE_ANSWER_SYSTEM_PROMPT = """You are a compassionate legal assistant specializing in Ontario tenancy law (Residential Tenancies Act, 2006).
+
+Your response structure:
+1. **Direct Answer**: State the answer clearly and empathetically
+2. **Legal Basis**: Cite specific RTA sections (e.g., "Section 120(1)")
+3. **Practical Implications**: Explain what this means in practice
+4. **Important Notes**: Highlight key conditions or exceptions
+
+Guidelines:
+- Use empathetic, human language (not robotic)
+- Always cite section numbers
+- Acknowledge the user's situation
+- Be precise but accessible"""
+
 
 class RAGState(TypedDict):
     """State for the RAG graph."""
@@ -30,33 +98,36 @@ class RAGState(TypedDict):
     summarized_context: str
 
 
-def classify_question(state: RAGState) -> RAGState:
-    """Classify if the question is relevant to Ontario tenancy law."""
-    question = state["question"]
+@functools.lru_cache(maxsize=1)
+def _get_classification_cache() -> SemanticCache:
+    """Get the semantic cache of question classifications."""
+    return SemanticCache(threshold=CLASSIFY_CACHE_THRESHOLD)
 
-    print("🔍 Classifying question relevance...")
 
-    llm = get_llm()
+def _get_question_embeddings():
+    """Get the embeddings model used to classify questions.
 
-    prompt = f"""You are a question classifier for an Ontario tenancy law assistant.
+    This is the retriever's own model, so retrieve_documents embedding the
+    same question hits the same embedding cache.
+    """
+    return get_retriever(k=RETRIEVE_K, filter=RETRIEVE_FILTER).vectorstore.embeddings
 
-Determine if the following question is related to:
-- Ontario rental/tenancy law
-- Residential Tenancies Act (RTA) 2006
-- Landlord-tenant relationships in Ontario
-- Housing rights in Ontario
-- Lease agreements in Ontario
-- Rent, evictions, maintenance, deposits, etc. in Ontario
 
-Question: "{question}"
+@functools.lru_cache(maxsize=1)
+def _get_relevant_example_embeddings() -> np.ndarray:
+    """Get the embeddings of RELEVANT_QUESTION_EXAMPLES (one row each)."""
+    embeddings = _get_question_embeddings().embed_documents(list(RELEVANT_QUESTION_EXAMPLES))
+    return np.asarray(embeddings, dtype=np.float32)
 
-Respond with ONLY:
-- "RELEVANT" if the question is about Ontario tenancy/rental law
-- "IRRELEVANT" if the question is about anything else (weather, sports, general chat, other provinces, other countries, non-housing topics, etc.)
 
-Your response:"""
+async def _classify_with_llm(question: str) -> bool:
+    """Ask the LLM whether a question is about Ontario tenancy law."""
+    llm = get_llm()
 
-    response = llm.invoke(prompt)
+    response = await llm.ainvoke([
+        SystemMessage(content=CLASSIFY_SYSTEM_PROMPT),
+        HumanMessage(content=f'Question: "{question}"\n\nYour response:'),
+    ])
     
     # Extract content from response
     if hasattr(response, 'content'):
@@ -66,27 +137,86 @@ Your response:"""
     else:
         classification = str(response).strip().upper()
 
-    if "RELEVANT" in classification:
-        state["is_relevant"] = True
-        state["topic"] = "ontario_tenancy_law"
-        print("✓ Question is relevant to Ontario tenancy law")
+    return "RELEVANT" in classification
+
+
+async def classify_question(state: RAGState) -> dict:
+    """Classify if the question is relevant to Ontario tenancy law.
+
+    Runs in parallel with retrieve_documents, so it returns only the state
+    keys it writes. Paraphrases of an already classified question are
+    answered from the classification cache (exact repeats of any prompt are
+    also served by the global LLM cache). Otherwise the question embedding
+    is compared with RELEVANT_QUESTION_EXAMPLES, and the LLM is only asked
+    when the similarity falls between the two CLASSIFY_*_SIMILARITY bounds.
+    Questions naming another jurisdiction skip the cache and the similarity
+    shortcut and always go to the LLM.
+    """
+    question = state["question"]
+
+    logger.debug("Classifying question relevance")
+
+    question_embedding = await _get_question_embeddings().aembed_query(question)
+    other_jurisdiction = mentions_other_jurisdiction(question)
+
+    # Questions that differ only by province embed far above the cache
+    # threshold, so decisions about other jurisdictions are never cached
+    # (nor served from the cache)
+    cache = None
+    if ENABLE_SEMANTIC_CACHE and not other_jurisdiction:
+        cache = _get_classification_cache()
+
+        cached = cache.lookup(question_embedding)
+        if cached is not None:
+            logger.info("Classification served from semantic cache")
+            return dict(cached)
+
+    if other_jurisdiction:
+        logger.info("Question names another jurisdiction, asking the LLM")
+        is_relevant = await _classify_with_llm(question)
     else:
-        state["is_relevant"] = False
-        state["topic"] = "off_topic"
-        print("⚠ Question is not relevant to Ontario tenancy law")
+        # The first call embeds the examples, which must not block the event loop
+        example_embeddings = await asyncio.to_thread(_get_relevant_example_embeddings)
+        similarity = float(np.max(
+            example_embeddings @ np.asarray(question_embedding, dtype=np.float32)
+        ))
+
+        if similarity >= CLASSIFY_RELEVANT_SIMILARITY:
+            is_relevant = True
+        elif similarity < CLASSIFY_IRRELEVANT_SIMILARITY:
+            is_relevant = False
+        else:
+            logger.info("Ambiguous similarity (%.2f), asking the LLM", similarity)
+            is_relevant = await _classify_with_llm(question)
+
+    if is_relevant:
+        logger.info("Question is relevant to Ontario tenancy law")
+        result = {"is_relevant": True, "topic": "ontario_tenancy_law"}
+    else:
+        logger.info("Question is not relevant to Ontario tenancy law")
+        result = {"is_relevant": False, "topic": "off_topic"}
 
-    return state
+    if cache is not None:
+        cache.add(question_embedding, result)
+
+    return result
 
 
-def retrieve_documents(state: RAGState) -> RAGState:
-    """Retrieve relevant documents from vector store with metadata filtering."""
+async def retrieve_documents(state: RAGState) -> dict:
+    """Retrieve relevant documents from vector store with metadata filtering.
+
+    Runs speculatively alongside classify_question rather than after it:
+    most questions are on-topic, so this takes the classification LLM call
+    off the critical path. The cost is one wasted vector search for
+    off-topic questions, whose results are simply ignored. Returns only the
+    state keys it writes.
+    """
     question = state["question"]
     chat_history = state.get("chat_history", [])
 
-    print(f"🔍 Retrieving documents for: {question}")
+    logger.debug("Retrieving documents for: %s", question)
 
-    metadata_filter = {"jurisdiction": "Ontario"}
-    retriever = get_retriever(k=7, filter=metadata_filter)
+    retriever = get_retriever(k=RETRIEVE_K, filter=RETRIEVE_FILTER)
 
     enhanced_query = question
     if chat_history:
@@ -97,29 +227,30 @@ def retrieve_documents(state: RAGState) -> RAGState:
         ])
         enhanced_query = f"Given this conversation:\n{history_context}\n\nCurrent question: {question}"
 
-    docs = retriever.invoke(enhanced_query)
+    docs = await retriever.ainvoke(enhanced_query)
 
-    seen_sections = set()
-    unique_docs = []
+    # Keep the highest-ranked document per (section, subsection), in rank order
+    docs_by_section = {}
     for doc in docs:
-        section_key = (
-            doc.metadata.get("section_number"),
-            doc.metadata.get("subsection_number")
+        metadata = doc.metadata
+        docs_by_section.setdefault(
+            (metadata.get("section_number"), metadata.get("subsection_number")),
+            doc,
         )
-        if section_key not in seen_sections:
-            seen_sections.add(section_key)
-            unique_docs.append(doc)
+    unique_docs = list(docs_by_section.values())
 
-    state["retrieved_docs"] = unique_docs
-    state["context"] = format_docs(unique_docs)
+    logger.info("Retrieved %d unique documents", len(unique_docs))
 
-    print(f"✓ Retrieved {len(unique_docs)} unique documents")
+    return {"retrieved_docs": unique_docs, "context": format_docs(unique_docs)}
 
-    return state
 
+async def summarize_context(state: RAGState) -> RAGState:
+    """Summarize retrieved context for cleaner, shorter input.
 
-def summarize_context(state: RAGState) -> RAGState:
-    """Summarize retrieved context for cleaner, shorter input."""
+    Context shorter than SUMMARIZE_MIN_CONTEXT_CHARS already fits the answer
+    prompt comfortably and is passed through without an LLM call; longer
+    context is summarized in full, so no retrieved section is dropped.
+    """
     context = state["context"]
     retrieved_docs = state["retrieved_docs"]
 
@@ -127,19 +258,19 @@ def summarize_context(state: RAGState) -> RAGState:
         state["summarized_context"] = ""
         return state
 
-    print("📝 Summarizing context...")
-
-    llm = get_llm()
-
-    prompt = f"""Summarize the following legal sections from the Ontario Residential Tenancies Act.
-Focus on key points, requirements, and conditions. Keep citations intact.
+    if len(context) < SUMMARIZE_MIN_CONTEXT_CHARS:
+        logger.info("Context is short (%d chars), skipping summarization", len(context))
+        state["summarized_context"] = context
+        return state
 
-Legal Context:
-{context[:2000]}
+    logger.debug("Summarizing context")
 
-Provide a concise summary maintaining all section numbers and key legal points."""
+    llm = get_llm()
 
-    response = llm.invoke(prompt)
+    response = await llm.ainvoke([
+        SystemMessage(content=SUMMARIZE_SYSTEM_PROMPT),
+        HumanMessage(content=f"Legal Context:\n{context}"),
+    ])
     
     # Extract content from response
     if hasattr(response, 'content'):
@@ -149,7 +280,7 @@ Provide a concise summary maintaining all section numbers and key legal points."
     else:
         state["summarized_context"] = str(response)
 
-    print("✓ Context summarized")
+    logger.info("Context summarized")
 
     return state
 
@@ -164,54 +295,44 @@ def check_relevance(state: RAGState) -> RAGState:
     return state
 
 
-def generate_answer(state: RAGState) -> RAGState:
-    """Generate answer using LLM with legal reasoning structure."""
+async def generate_answer(state: RAGState) -> RAGState:
+    """Generate answer using LLM with legal reasoning structure.
+
+    The response is streamed from the LLM, so callers using
+    stream_mode="messages" receive tokens as they are generated.
+    """
     question = state["question"]
     summarized_context = state.get("summarized_context", state["context"])
     chat_history = state.get("chat_history", [])
 
-    print("💬 Generating answer with legal reasoning...")
+    logger.debug("Generating answer")
 
     llm = get_llm(temperature=0.1)
 
     history_text = ""
     if chat_history:
         recent_history = chat_history[-4:]
-        history_text = "\n\nConversation History:\n"
+        history_text = "Conversation History:\n"
         for msg in recent_history:
             role = "User" if msg["role"] == "user" else "Assistant"
             history_text += f"{role}: {msg['content'][:150]}...\n"
+        history_text += "\n"
 
-    prompt = f"""You are a compassionate legal assistant specializing in Ontario tenancy law (Residential Tenancies Act, 2006).
-
-Your response structure:
-1. **Direct Answer**: State the answer clearly and empathetically
-2. **Legal Basis**: Cite specific RTA sections (e.g., "Section 120(1)")
-3. **Practical Implications**: Explain what this means in practice
-4. **Important Notes**: Highlight key conditions or exceptions
-
-Guidelines:
-- Use empathetic, human language (not robotic)
-- Always cite section numbers
-- Acknowledge the user's situation
-- Be precise but accessible{history_text}
-
-Legal Context:
+    prompt = f"""{history_text}Legal Context:
 {summarized_context}
 
 Question: {question}
 
 Your Response:"""
 
-    response = llm.invoke(prompt)
-    
-    # Extract content from response (handles both string and message types)
-    if hasattr(response, 'content'):
-        answer_content = response.content
-    elif isinstance(response, str):
-        answer_content = response
-    else:
-        answer_content = str(response)
+    # Stream the response (handles both string and message chunks)
+    answer_parts = []
+    async for chunk in llm.astream([
+        SystemMessage(content=GENERATE_ANSWER_SYSTEM_PROMPT),
+        HumanMessage(content=prompt),
+    ]):
+        answer_parts.append(chunk.content if hasattr(chunk, 'content') else str(chunk))
+    answer_content = "".join(answer_parts)
 
     state["answer"] = answer_content
     state["messages"] = [
@@ -219,7 +340,7 @@ Your Response:"""
         AIMessage(content=answer_content)
     ]
 
-    print(f"✓ Answer generated with legal reasoning and empathy (length: {len(answer_content)})")
+    logger.info("Answer generated (length: %d)", len(answer_content))
 
     return state
 
@@ -278,15 +399,10 @@ For example, instead of "What are my rights?", you could ask "What are a tenant'
     return state
 
 
-def route_after_classification(state: RAGState) -> str:
-    """Route based on question relevance."""
+def route_after_retrieval(state: RAGState) -> str:
+    """Route based on question relevance, then on whether clarification is needed."""
     if not state.get("is_relevant", True):
         return "off_topic"
-    return "retrieve"
-
-
-def route_after_retrieval(state: RAGState) -> str:
-    """Route based on whether clarification is needed."""
     if state.get("needs_clarification", False):
         return "clarification"
     return "summarize"
@@ -308,43 +424,65 @@ def create_rag_graph():
     workflow.add_node("generate", generate_answer)
     workflow.add_node("clarification", request_clarification)
 
-    workflow.set_entry_point("classify")
-
-    workflow.add_conditional_edges(
-        "classify",
-        route_after_classification,
-        {
-            "off_topic": "off_topic",
-            "retrieve": "retrieve",
-        }
-    )
-
-    workflow.add_edge("off_topic", END)
-    workflow.add_edge("retrieve", "check_relevance")
+    # Classification and retrieval start together and join before routing
+    workflow.add_edge(START, "classify")
+    workflow.add_edge(START, "retrieve")
+    workflow.add_edge(["classify", "retrieve"], "check_relevance")
 
     workflow.add_conditional_edges(
         "check_relevance",
         route_after_retrieval,
         {
+            "off_topic": "off_topic",
             "summarize": "summarize",
             "clarification": "clarification",
         }
     )
 
+    workflow.add_edge("off_topic", END)
+
     workflow.add_edge("summarize", "generate")
     workflow.add_edge("generate", END)
     workflow.add_edge("clarification", END)
 
     app = workflow.compile()
 
-    print("✓ Enhanced RAG graph compiled")
+    logger.info("Enhanced RAG graph compiled")
 
     return app
 
 
+@functools.lru_cache(maxsize=1)
+def get_rag_graph():
+    """Get the RAG workflow graph, compiled once per process.
+
+    The compiled graph holds no per-query state, so it is safe to share
+    between requests and chat sessions.
+
+    Returns:
+        Compiled LangGraph workflow
+    """
+    return create_rag_graph()
+
+
+def warm_up_rag_graph() -> None:
+    """Do the RAG graph's one-time setup ahead of the first query.
+
+    Compiles the graph, loads the classification embeddings, and runs one
+    retrieval so the embeddings model is loaded and the Pinecone connection
+    is open before a user is waiting on them.
+    """
+    get_rag_graph()
+    _get_relevant_example_embeddings()
+    get_retriever(k=RETRIEVE_K, filter=RETRIEVE_FILTER).invoke("warmup")
+
+
 def query_with_graph(question: str, chat_history: list = None) -> dict:
     """Query using the LangGraph workflow.
 
+    Synchronous wrapper around aquery_with_graph; use that one from code
+    that already runs an event loop.
+
     Args:
         question: User's question
         chat_history: Optional conversation history for context
@@ -352,16 +490,35 @@ def query_with_graph(question: str, chat_history: list = None) -> dict:
     Returns:
         Final state with answer
     """
-    print("=" * 70)
-    print("🔍 RAG GRAPH QUERY")
-    print("=" * 70)
-    print(f"\nQuestion: {question}")
-    if chat_history:
-        print(f"With {len(chat_history)} previous messages\n")
-    else:
-        print()
+    return asyncio.run(aquery_with_graph(question, chat_history))
+
+
+async def aquery_with_graph(question: str, chat_history: list = None) -> dict:
+    """Query using the LangGraph workflow (async).
 
-    app = create_rag_graph()
+    Args:
+        question: User's question
+        chat_history: Optional conversation history for context
+
+    Returns:
+        Final state with answer
+
+    The question and the streamed answer are printed only when INFO logging
+    is enabled for this module (see LOG_LEVEL in config.py).
+    """
+    verbose = logger.isEnabledFor(logging.INFO)
+
+    if verbose:
+        print("=" * 70)
+        print("🔍 RAG GRAPH QUERY")
+        print("=" * 70)
+        print(f"\nQuestion: {question}")
+        if chat_history:
+            print(f"With {len(chat_history)} previous messages\n")
+        else:
+            print()
+
+    app = get_rag_graph()
 
     initial_state = {
         "question": question,
@@ -377,13 +534,35 @@ def query_with_graph(question: str, chat_history: list = None) -> dict:
         "summarized_context": "",
     }
 
-    result = app.invoke(initial_state)
-
-    print("\n" + "=" * 70)
-    print("💡 ANSWER")
-    print("=" * 70)
-    print(result["answer"])
-    print("\n")
+    if not verbose:
+        return await app.ainvoke(initial_state)
+
+    # Print answer tokens as they are generated; "values" carries the final state
+    result = None
+    answer_streamed = False
+    async for mode, event in app.astream(initial_state, stream_mode=["messages", "values"]):
+        if mode == "values":
+            result = event
+            continue
+
+        chunk, metadata = event
+        if metadata.get("langgraph_node") != "generate" or not chunk.content:
+            continue
+
+        if not answer_streamed:
+            print("\n" + "=" * 70)
+            print("💡 ANSWER")
+            print("=" * 70)
+            answer_streamed = True
+        print(chunk.content, end="", flush=True)
+
+    if not answer_streamed:
+        # Off-topic and clarification answers are not generated by the LLM
+        print("\n" + "=" * 70)
+        print("💡 ANSWER")
+        print("=" * 70)
+        print(result["answer"], end="")
+    print("\n\n")
 
     return result
 
@@ -1,11 +1,13 @@
 """Chainlit event handlers for chat and file uploads."""
 
+import logging
+
 import chainlit as cl
 from pathlib import Path
 
 from src.core.qa import get_answer
-from src.langchain.rag_graph import create_rag_graph
-from src.langchain import analyze_contract
+from src.langchain.rag_graph import get_rag_graph
+from src.langchain import astream_contract_analysis
 
 # File processing imports
 try:
@@ -22,6 +24,20 @@ try:
 except ImportError:
     Document = None
 
+logger = logging.getLogger(__name__)
+
+
+# Graph nodes whose state carries the final answer
+FINAL_NODES = frozenset({"generate", "off_topic", "clarification"})
+
+# Progress shown as each contract analysis step finishes
+CONTRACT_STEP_MESSAGES = {
+    "extract_clauses": "✓ Extracted contract clauses\n\n",
+    "retrieve_laws": "✓ Retrieved relevant sections\n\n",
+    "check_compliance": "✓ Checked compliance\n\n",
+    "generate_recommendations": "✓ Drafted recommendations\n\n",
+}
+
 
 # ============================================================================
 # File Processing Functions
@@ -66,7 +82,7 @@ async def process_uploaded_file(file: cl.File) -> str:
     try:
         if file_ext == ".pdf":
             return extract_text_from_pdf(file.path)
-        elif file_ext in [".docx", ".doc"]:
+        elif file_ext in (".docx", ".doc"):
             return extract_text_from_docx(file.path)
         elif file_ext == ".txt":
             return extract_text_from_txt(file.path)
@@ -130,11 +146,18 @@ async def analyze_uploaded_contract():
     await response_msg.send()
 
     try:
-        await response_msg.stream_token("🔍 Extracting contract clauses...\n\n")
-
-        result = analyze_contract(contract_text=contract_data["text"])
-
-        analysis_result = result.get("analysis_result", "")
+        await response_msg.stream_token("🔍 Extracting contract clauses and searching relevant laws...\n\n")
+
+        # Report each analysis step as it finishes rather than after the
+        # whole graph has run
+        analysis_result = ""
+        async for node_name, update in astream_contract_analysis(contract_text=contract_data["text"]):
+            logger.debug("Contract graph node: %s", node_name)
+
+            if node_name in CONTRACT_STEP_MESSAGES:
+                await response_msg.stream_token(CONTRACT_STEP_MESSAGES[node_name])
+            elif node_name == "generate_report":
+                analysis_result = update.get("analysis_result", "")
         
         if not analysis_result:
             analysis_result = "⚠️ Analysis completed but no report was generated. Please try again."
@@ -163,7 +186,7 @@ async def on_chat_start():
 
     try:
         # Initialize LangGraph RAG system
-        rag_graph = create_rag_graph()
+        rag_graph = get_rag_graph()
         cl.user_session.set("rag_graph", rag_graph)
 
         welcome_msg = """### Welcome to Ontario Tenancy Assistant
@@ -226,67 +249,80 @@ async def on_message(message: cl.Message):
         is_off_topic = False
         answer_streamed = False
 
-        # Stream through the graph execution and capture final state
-        async for event in rag_graph.astream(initial_state):
+        # Stream through the graph execution and capture final state;
+        # "messages" events carry answer tokens as the LLM generates them
+        async for mode, event in rag_graph.astream(initial_state, stream_mode=["updates", "messages"]):
+            if mode == "messages":
+                chunk, metadata = event
+                if metadata.get("langgraph_node") == "generate" and chunk.content:
+                    if not answer_streamed:
+                        await response_msg.stream_token("💬 Generating answer...\n\n")
+                        answer_streamed = True
+                    await response_msg.stream_token(chunk.content)
+                continue
+
             for node_name, node_state in event.items():
-                print(f"📊 Graph node: {node_name}, has answer: {bool(node_state.get('answer'))}")
+                logger.debug("Graph node: %s, has answer: %s", node_name, bool(node_state.get("answer")))
                 
                 # Always update final_result with latest state from ending nodes
-                if node_name in ["generate", "off_topic", "clarification"]:
+                if node_name in FINAL_NODES:
                     final_result = node_state
-                    print(f"📌 Captured final state from {node_name}")
+                    logger.debug("Captured final state from %s", node_name)
                 
                 if node_name == "classify":
                     if not node_state.get("is_relevant", True):
                         is_off_topic = True
                         await response_msg.stream_token("⚠️ Question may not be related to Ontario tenancy law...\n\n")
                 
-                elif node_name == "retrieve":
+                # classify and retrieve run in parallel and report in either
+                # order; check_relevance runs once both are done, so by then
+                # is_off_topic is known
+                elif node_name == "check_relevance" and not is_off_topic:
                     await response_msg.stream_token("✓ Retrieved relevant sections\n\n")
                 
                 elif node_name == "summarize":
                     await response_msg.stream_token("📝 Summarizing context...\n\n")
                 
                 elif node_name == "generate":
-                    await response_msg.stream_token("💬 Generating answer...\n\n")
-                    # Get the answer from state and stream it
+                    # Tokens were normally streamed above; fall back to the state
                     answer = node_state.get("answer", "")
-                    print(f"📝 Generated answer length: {len(answer) if answer else 0}")
-                    if answer:
+                    logger.debug("Generated answer length: %d", len(answer) if answer else 0)
+                    if answer and not answer_streamed:
+                        await response_msg.stream_token("💬 Generating answer...\n\n")
                         # Stream answer in chunks
                         chunk_size = 50
                         for i in range(0, len(answer), chunk_size):
                             chunk = answer[i:i+chunk_size]
                             await response_msg.stream_token(chunk)
                         answer_streamed = True
-                    else:
-                        print("⚠️ Warning: generate node completed but answer is empty")
+                    elif not answer:
+                        logger.warning("generate node completed but answer is empty")
                 
                 elif node_name == "off_topic":
                     answer = node_state.get("answer", "")
-                    print(f"📝 Off-topic answer length: {len(answer) if answer else 0}")
+                    logger.debug("Off-topic answer length: %d", len(answer) if answer else 0)
                     if answer:
                         await response_msg.stream_token(answer)
                         answer_streamed = True
                 
                 elif node_name == "clarification":
                     answer = node_state.get("answer", "")
-                    print(f"📝 Clarification answer length: {len(answer) if answer else 0}")
+                    logger.debug("Clarification answer length: %d", len(answer) if answer else 0)
                     if answer:
                         await response_msg.stream_token(answer)
                         answer_streamed = True
 
         # After graph completes, add sources and metadata
-        print(f"🔍 Final result check: {final_result is not None}")
+        logger.debug("Final result check: %s", final_result is not None)
         if final_result:
             needs_clarification = final_result.get("needs_clarification", False)
             is_relevant = final_result.get("is_relevant", True)
             answer = final_result.get("answer", "")
-            print(f"📊 Final answer length: {len(answer) if answer else 0}, streamed: {answer_streamed}")
+            logger.debug("Final answer length: %d, streamed: %s", len(answer) if answer else 0, answer_streamed)
 
             if answer and not answer_streamed:
                 # Stream answer if it wasn't streamed during graph execution
-                print("📤 Streaming answer that wasn't streamed during execution...")
+                logger.debug("Streaming answer that wasn't streamed during execution")
                 chunk_size = 50
                 for i in range(0, len(answer), chunk_size):
                     chunk = answer[i:i+chunk_size]
@@ -322,12 +358,12 @@ async def on_message(message: cl.Message):
                 # Update chat history
                 chat_history.append({"role": "assistant", "content": answer})
                 cl.user_session.set("chat_history", chat_history)
-                print(f"✓ Answer saved to chat history (length: {len(answer)})")
+                logger.debug("Answer saved to chat history (length: %d)", len(answer))
             else:
-                print("⚠️ Warning: final_result exists but answer is empty")
+                logger.warning("final_result exists but answer is empty")
                 await response_msg.stream_token("\n\n⚠️ Answer was generated but is empty. Please try again.")
         else:
-            print("❌ Error: No final result from graph execution")
+            logger.error("No final result from graph execution")
             await response_msg.stream_token("\n\n⚠️ No response generated. Please try again.")
 
         await response_msg.update()
@@ -346,5 +382,5 @@ async def on_chat_end():
 @cl.on_chat_resume
 async def on_chat_resume(thread: dict):
     """Handle chat session resume."""
-    print(f"Resuming chat thread: {thread.get('id', 'unknown')}")
+    logger.info("Resuming chat thread: %s", thread.get("id", "unknown"))
     pass